@@ -1 +1,3 @@
-from .engine import Event, EventEngine, EVENT_TIMER
+from .engine import Event, EventEngine, EVENT_TIMER, EVENT_METRICS
+from .async_engine import AsyncEventEngine
+from .shared import SharedEventPublisher, SharedEventSubscriber
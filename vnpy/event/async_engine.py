@@ -0,0 +1,241 @@
+"""
+Asyncio based event engine.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import Future
+from inspect import isawaitable
+from threading import Lock, Thread, get_ident
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .engine import Event, EVENT_TIMER
+
+# Defines handler function to be used in async event engine,
+# can be either normal function or coroutine function.
+AsyncHandlerType: callable = Callable[[Event], Any]
+
+
+class AsyncEventEngine:
+    """
+    Event engine running on an asyncio event loop, with the same
+    register/put API as EventEngine.
+
+    Handlers can be coroutine functions, which are awaited one by one
+    so that ordering of events is kept. Put can be called from any
+    thread, events from other threads are handed over to the loop
+    without blocking the caller.
+    """
+
+    def __init__(
+        self,
+        interval: int = 1,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> None:
+        """
+        Timer event is generated every 1 second by default, if
+        interval not specified.
+
+        If loop is not passed, a new event loop is created and run
+        in a separate thread when engine started.
+        """
+        self._interval: int = interval
+        self._loop: Optional[asyncio.AbstractEventLoop] = loop
+        self._own_loop: bool = loop is None
+        self._thread: Optional[Thread] = None
+        self._loop_thread: int = 0
+
+        self._queue: deque = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._active: bool = False
+
+        # Handlers are stored in tuples which are rebuilt when changed
+        self._handlers: Dict[str, Tuple[AsyncHandlerType, ...]] = {}
+        self._general_handlers: Tuple[AsyncHandlerType, ...] = ()
+        self._handler_lock: Lock = Lock()
+
+    def _start_tasks(self) -> None:
+        """
+        Create processing and timer tasks, called in loop thread.
+        """
+        self._loop_thread = get_ident()
+        self._wakeup = asyncio.Event()
+
+        self._tasks = [
+            self._loop.create_task(self._run()),
+            self._loop.create_task(self._run_timer())
+        ]
+
+    def _wake(self) -> None:
+        """
+        Wake up processing task, called in loop thread.
+        """
+        if self._wakeup:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        """
+        Get event from queue and then process it.
+        """
+        while self._active:
+            if not self._queue:
+                self._wakeup.clear()
+
+                # Check again in case event put before wakeup cleared
+                if not self._queue:
+                    await self._wakeup.wait()
+                    continue
+
+            event: Event = self._queue.popleft()
+            await self._process(event)
+
+    async def _process(self, event: Event) -> None:
+        """
+        Distribute event to handlers of its type, its type + subtype
+        and then general handlers. Awaitable results are awaited.
+
+        Exceptions raised by handlers are passed to exception handler
+        of the loop, which logs them by default.
+        """
+        handlers: tuple = self._handlers.get(event.type, ())
+
+        if event.subtype:
+            handlers += self._handlers.get(event.type + event.subtype, ())
+
+        handlers += self._general_handlers
+
+        for handler in handlers:
+            # Error of one handler should neither stop processing task
+            # nor skip other handlers, report it by exception handler.
+            try:
+                result: Any = handler(event)
+                if isawaitable(result):
+                    await result
+            except Exception as e:
+                self._loop.call_exception_handler({
+                    "message": f"Exception in handler {handler!r} of event {event.type}",
+                    "exception": e
+                })
+
+    async def _run_timer(self) -> None:
+        """
+        Sleep by interval second(s) and then generate a timer event.
+        """
+        while self._active:
+            await asyncio.sleep(self._interval)
+            self.put(Event(EVENT_TIMER))
+
+    def start(self) -> None:
+        """
+        Start event engine to process events and generate timer events.
+        """
+        self._active = True
+
+        if self._own_loop:
+            self._loop = asyncio.new_event_loop()
+            self._thread = Thread(target=self._run_loop)
+            self._thread.start()
+
+        self._loop.call_soon_threadsafe(self._start_tasks)
+
+    def _run_loop(self) -> None:
+        """
+        Run the event loop owned by engine.
+        """
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def stop(self) -> None:
+        """
+        Stop event engine.
+        """
+        self._active = False
+
+        if not self._loop:
+            return
+
+        future: Future = asyncio.run_coroutine_threadsafe(self._stop_tasks(), self._loop)
+
+        # Wait for tasks exited before stopping the loop owned by engine
+        if self._own_loop and self._thread:
+            future.result()
+
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+            self._thread = None
+            self._loop = None
+
+    async def _stop_tasks(self) -> None:
+        """
+        Cancel processing and timer tasks, and wait until they exit.
+        """
+        tasks: List[asyncio.Task] = self._tasks
+        self._tasks = []
+        self._wakeup = None
+
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def put(self, event: Event) -> None:
+        """
+        Put an event object into event queue, thread-safe.
+        """
+        self._queue.append(event)
+
+        wakeup: Optional[asyncio.Event] = self._wakeup
+        if not wakeup or wakeup.is_set():
+            return
+
+        if get_ident() == self._loop_thread:
+            wakeup.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wake)
+
+    def register(self, type: str, handler: AsyncHandlerType) -> None:
+        """
+        Register a new handler function for a specific event type. Every
+        function can only be registered once for each event type.
+        """
+        with self._handler_lock:
+            handlers: tuple = self._handlers.get(type, ())
+            if handler not in handlers:
+                self._handlers[type] = handlers + (handler,)
+
+    def unregister(self, type: str, handler: AsyncHandlerType) -> None:
+        """
+        Unregister an existing handler function from event engine.
+        """
+        with self._handler_lock:
+            handlers: tuple = self._handlers.get(type, ())
+            if handler not in handlers:
+                return
+
+            handlers = tuple([h for h in handlers if h != handler])
+            if handlers:
+                self._handlers[type] = handlers
+            else:
+                self._handlers.pop(type)
+
+    def register_general(self, handler: AsyncHandlerType) -> None:
+        """
+        Register a new handler function for all event types. Every
+        function can only be registered once for each event type.
+        """
+        with self._handler_lock:
+            if handler not in self._general_handlers:
+                self._general_handlers = self._general_handlers + (handler,)
+
+    def unregister_general(self, handler: AsyncHandlerType) -> None:
+        """
+        Unregister an existing general handler function.
+        """
+        with self._handler_lock:
+            if handler in self._general_handlers:
+                self._general_handlers = tuple(
+                    [h for h in self._general_handlers if h != handler]
+                )
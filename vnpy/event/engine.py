@@ -2,13 +2,35 @@
 Event-driven framework of VeighNa framework.
 """
 
-from collections import defaultdict
+from collections import defaultdict, deque
+from heapq import heappop, heappush
+from itertools import count
 from queue import Empty, Queue
-from threading import Thread
-from time import sleep
-from typing import Any, Callable, List
+from threading import Condition, Lock, Thread, Event as Signal
+from time import monotonic, perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .metrics import EventMetrics, get_handler_name
 
 EVENT_TIMER = "eTimer"
+EVENT_METRICS = "eMetrics"
+
+# Interval in seconds for publishing metrics event.
+METRICS_INTERVAL = 10
+
+# Max number of event types cached for shard routing.
+ROUTE_CACHE_SIZE = 10000
+
+
+def match_prefix(type: str, prefixes: Sequence[str]) -> str:
+    """
+    Return the longest prefix matched by event type, or empty string.
+    """
+    matched: str = ""
+    for prefix in prefixes:
+        if type.startswith(prefix) and len(prefix) > len(matched):
+            matched = prefix
+    return matched
 
 
 class Event:
@@ -16,73 +38,476 @@ class Event:
     Event object consists of a type string which is used
     by event engine for distributing event, and a data
     object which contains the real data.
+
+    An optional subtype (e.g. vt_symbol) can be attached, then
+    the event is also distributed to handlers registered with
+    type + subtype, without putting another event.
     """
 
-    def __init__(self, type: str, data: Any = None) -> None:
+    def __init__(self, type: str, data: Any = None, subtype: str = "") -> None:
         """"""
         self.type: str = type
         self.data: Any = data
+        self.subtype: str = subtype
+
+        # Set by event engine if event is pending for conflation
+        self.conflate_key: Optional[tuple] = None
 
 
 # Defines handler function to be used in event engine.
 HandlerType: callable = Callable[[Event], None]
 
 
+class EventQueue(Queue):
+    """
+    Standard queue which can also get a batch of events within one
+    lock acquisition.
+    """
+
+    def get_batch(self, count: int, timeout: float) -> List[Event]:
+        """
+        Get at most count events, wait until timeout if queue is empty.
+        """
+        with self.not_empty:
+            if not self._qsize():
+                self.not_empty.wait(timeout)
+
+            events: List[Event] = []
+            while self._qsize() and len(events) < count:
+                events.append(self._get())
+
+            if events:
+                self.not_full.notify()
+
+        return events
+
+
+class DequeQueue:
+    """
+    Lock-free queue based on collections.deque, whose append and popleft
+    are atomic in CPython. The signal is only used for waking up the
+    consumer when queue is empty.
+
+    Only one consumer thread is supported.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self._deque: deque = deque()
+        self._signal: Signal = Signal()
+
+    def put(self, event: Event) -> None:
+        """
+        Put an event into queue.
+        """
+        self._deque.append(event)
+
+        if not self._signal.is_set():
+            self._signal.set()
+
+    def get(self, block: bool = True, timeout: float = None) -> Event:
+        """
+        Get an event from queue, raise Empty if no event available.
+        """
+        if not block:
+            timeout = 0
+
+        events: List[Event] = self.get_batch(1, timeout)
+        if not events:
+            raise Empty
+        return events[0]
+
+    def get_batch(self, count: int, timeout: float) -> List[Event]:
+        """
+        Get at most count events, wait until timeout if queue is empty.
+        """
+        if not self._deque:
+            self._signal.clear()
+
+            # Check again in case event put before signal cleared
+            if not self._deque:
+                self._signal.wait(timeout)
+
+        popleft: Callable = self._deque.popleft
+        return [popleft() for _ in range(min(count, len(self._deque)))]
+
+    def qsize(self) -> int:
+        """
+        Return number of events in queue.
+        """
+        return len(self._deque)
+
+    def empty(self) -> bool:
+        """
+        Check if queue is empty.
+        """
+        return not self._deque
+
+
+class PriorityEventQueue:
+    """
+    Queue with several lanes of different priority. Events are always
+    got from the lane of highest priority first, and are kept in FIFO
+    order within each lane.
+
+    Priorities is a dict of event type prefix to priority level, lower
+    level means higher priority. Events not matched by any prefix are
+    put into the lane of lowest priority.
+
+    Lanes are based on collections.deque, so only one consumer thread
+    is supported.
+    """
+
+    def __init__(self, priorities: Dict[str, int]) -> None:
+        """"""
+        self._priorities: Dict[str, int] = priorities
+        self._levels: Dict[str, int] = {}
+        self._default_level: int = max(priorities.values()) + 1
+
+        self._lanes: List[deque] = [deque() for _ in range(self._default_level + 1)]
+        self._signal: Signal = Signal()
+
+    def _get_level(self, type: str) -> int:
+        """
+        Get priority level of event type by longest matched prefix.
+        """
+        prefix: str = match_prefix(type, self._priorities.keys())
+        level: int = self._priorities.get(prefix, self._default_level)
+
+        if len(self._levels) >= ROUTE_CACHE_SIZE:
+            self._levels.clear()
+        self._levels[type] = level
+
+        return level
+
+    def put(self, event: Event) -> None:
+        """
+        Put an event into the lane of its priority.
+        """
+        level: Optional[int] = self._levels.get(event.type, None)
+        if level is None:
+            level = self._get_level(event.type)
+
+        self._lanes[level].append(event)
+
+        if not self._signal.is_set():
+            self._signal.set()
+
+    def get(self, block: bool = True, timeout: float = None) -> Event:
+        """
+        Get the event of highest priority, raise Empty if no event available.
+        """
+        if not block:
+            timeout = 0
+
+        events: List[Event] = self.get_batch(1, timeout)
+        if not events:
+            raise Empty
+        return events[0]
+
+    def get_batch(self, count: int, timeout: float) -> List[Event]:
+        """
+        Get at most count events in priority order, wait until timeout
+        if queue is empty.
+        """
+        if self.empty():
+            self._signal.clear()
+
+            # Check again in case event put before signal cleared
+            if self.empty():
+                self._signal.wait(timeout)
+
+        events: List[Event] = []
+
+        for lane in self._lanes:
+            n: int = min(count - len(events), len(lane))
+            events.extend([lane.popleft() for _ in range(n)])
+
+            if len(events) >= count:
+                break
+
+        return events
+
+    def qsize(self) -> int:
+        """
+        Return number of events in all lanes.
+        """
+        return sum([len(lane) for lane in self._lanes])
+
+    def empty(self) -> bool:
+        """
+        Check if all lanes are empty.
+        """
+        for lane in self._lanes:
+            if lane:
+                return False
+        return True
+
+
 class EventEngine:
     """
     Event engine distributes event object based on its type
     to those handlers registered.
 
     It also generates timer event by every interval seconds,
-    which can be used for timing purpose.
+    which can be used for timing purpose. More timers with
+    different (sub-second) periods and one-shot deadlines can
+    be added, all scheduled by monotonic clock without drift.
+
+    Optionally event types can be sharded onto dedicated threads, so
+    that slow handlers (e.g. log or UI) do not delay other events.
     """
 
-    def __init__(self, interval: int = 1) -> None:
+    def __init__(
+        self,
+        interval: float = 1,
+        shards: Optional[Dict[str, Sequence[str]]] = None,
+        batch_size: int = 1,
+        lock_free: bool = False,
+        conflate: Optional[Sequence[str]] = None,
+        priorities: Optional[Dict[str, int]] = None,
+        metrics: bool = False
+    ) -> None:
         """
         Timer event is generated every 1 second by default, if
         interval not specified.
+
+        Shards is a dict of shard name to event type prefixes, such as
+        {"tick": [EVENT_TICK]}. Events matching the prefixes of a shard
+        are processed by its own thread and queue, while all other events
+        are processed by the default thread. One event type is always
+        routed to the same thread, so ordering of each type is kept, but
+        handlers of different shards may run concurrently.
+
+        If batch_size is larger than 1, all queued events (up to
+        batch_size) are drained at once and then processed in a loop.
+        If lock_free is True, a deque based queue is used instead of
+        the standard Queue.
+
+        Conflate is a list of event type prefixes, such as [EVENT_TICK].
+        For these types, if an event of the same vt_symbol is still
+        pending in queue, its data is replaced by the newer one instead
+        of queuing another event, so only the latest data is delivered.
+
+        Priorities is a dict of event type prefix to priority level (lower
+        is more urgent), such as EVENT_PRIORITIES in vnpy.trader.event.
+        If passed, every queue is split into priority lanes so that events
+        like trade and order are processed before ticks and logs queued
+        earlier. Ordering within the same event type is kept.
+
+        If metrics is True, queue wait time of each event type, execution
+        time of each handler and max queue depth are recorded, which can
+        be got by get_metrics and are also published as EVENT_METRICS
+        every METRICS_INTERVAL seconds.
         """
-        self._interval: int = interval
-        self._queue: Queue = Queue()
+        self._interval: float = interval
+        self._batch_size: int = batch_size
+        self._lock_free: bool = lock_free
+        self._priorities: Optional[Dict[str, int]] = priorities
+
+        self._queue: Queue = self._new_queue()
         self._active: bool = False
-        self._thread: Thread = Thread(target=self._run)
+        self._thread: Thread = Thread(target=self._run, args=(self._queue,))
         self._timer: Thread = Thread(target=self._run_timer)
-        self._handlers: defaultdict = defaultdict(list)
-        self._general_handlers: List = []
+        self._timer_condition: Condition = Condition()
+        self._timer_schedule: list = []
+        self._timer_generations: Dict[str, int] = {}
+        self._timer_count: count = count()
+
+        # Handlers are stored in tuples which are rebuilt when changed,
+        # so dispatching needs neither copying nor locking.
+        self._handlers: Dict[str, Tuple[HandlerType, ...]] = {}
+        self._general_handlers: Tuple[HandlerType, ...] = ()
+        self._handler_lock: Lock = Lock()
+
+        self._shard_queues: Dict[str, Queue] = {}
+        self._shard_threads: List[Thread] = []
+        self._routes: Dict[str, Queue] = {}
+
+        if shards:
+            for name, prefixes in shards.items():
+                queue: Queue = self._new_queue()
+                thread: Thread = Thread(
+                    target=self._run,
+                    args=(queue,),
+                    name=f"EventEngine-{name}"
+                )
+                self._shard_threads.append(thread)
+
+                for prefix in prefixes:
+                    self._shard_queues[prefix] = queue
+
+        self._conflate_prefixes: List[str] = list(conflate) if conflate else []
+        self._conflate_types: Dict[str, bool] = {}
+        self._conflate_lock: Lock = Lock()
+        self._pending: Dict[tuple, Event] = {}
+        self._conflated_counts: defaultdict = defaultdict(int)
+
+        self._metrics: Optional[EventMetrics] = EventMetrics() if metrics else None
 
-    def _run(self) -> None:
+        self.add_timer(EVENT_TIMER, interval)
+        if metrics:
+            self.add_timer(EVENT_METRICS, METRICS_INTERVAL)
+
+    def _new_queue(self) -> Queue:
+        """
+        Create a new event queue.
+        """
+        if self._priorities:
+            return PriorityEventQueue(self._priorities)
+        elif self._lock_free:
+            return DequeQueue()
+        else:
+            return EventQueue()
+
+    def _run(self, queue: Queue) -> None:
         """
         Get event from queue and then process it.
         """
+        if self._batch_size > 1:
+            self._run_batch(queue)
+            return
+
         while self._active:
             try:
-                event: Event = self._queue.get(block=True, timeout=1)
+                event: Event = queue.get(block=True, timeout=1)
                 self._process(event)
             except Empty:
                 pass
 
+    def _run_batch(self, queue: Queue) -> None:
+        """
+        Get a batch of events from queue and then process them.
+        """
+        batch_size: int = self._batch_size
+
+        while self._active:
+            for event in queue.get_batch(batch_size, 1):
+                self._process(event)
+
     def _process(self, event: Event) -> None:
         """
         First distribute event to those handlers registered listening
-        to this type.
+        to this type, and then to type + subtype if event has subtype.
 
         Then distribute event to those general handlers which listens
         to all types.
         """
-        if event.type in self._handlers:
-            [handler(event) for handler in self._handlers[event.type]]
+        if event.conflate_key:
+            self._release(event)
 
-        if self._general_handlers:
-            [handler(event) for handler in self._general_handlers]
+        if self._metrics:
+            self._metrics.record_wait(event.type, perf_counter() - event.put_time)
+
+        handlers: Optional[tuple] = self._handlers.get(event.type, None)
+        if handlers:
+            self._call(handlers, event)
+
+        if event.subtype:
+            handlers = self._handlers.get(event.type + event.subtype, None)
+            if handlers:
+                self._call(handlers, event)
+
+        handlers = self._general_handlers
+        if handlers:
+            self._call(handlers, event)
+
+    def _call(self, handlers: Tuple[HandlerType, ...], event: Event) -> None:
+        """
+        Call handlers with event, and record execution time if metrics enabled.
+        """
+        if not self._metrics:
+            for handler in handlers:
+                handler(event)
+            return
+
+        for handler in handlers:
+            start: float = perf_counter()
+            handler(event)
+            self._metrics.record_handler(get_handler_name(handler), perf_counter() - start)
 
     def _run_timer(self) -> None:
         """
-        Sleep by interval second(s) and then generate a timer event.
+        Wait until the nearest deadline and then generate a timer event.
         """
-        while self._active:
-            sleep(self._interval)
-            event: Event = Event(EVENT_TIMER)
-            self.put(event)
+        with self._timer_condition:
+            while self._active:
+                if not self._timer_schedule:
+                    self._timer_condition.wait()
+                    continue
+
+                deadline, _, type, interval, data, generation = self._timer_schedule[0]
+
+                now: float = monotonic()
+                if deadline > now:
+                    self._timer_condition.wait(deadline - now)
+                    continue
+
+                heappop(self._timer_schedule)
+
+                # Skip timer removed or replaced
+                if self._timer_generations.get(type, None) != generation:
+                    continue
+
+                if interval:
+                    # Next deadline is based on last deadline rather than
+                    # current time, missed ones are skipped if fallen behind.
+                    deadline += interval
+                    if deadline <= now:
+                        deadline += ((now - deadline) // interval + 1) * interval
+
+                    self._schedule_timer(deadline, type, interval, data, generation)
+                else:
+                    self._timer_generations.pop(type)
+
+                if type == EVENT_METRICS:
+                    data = self.get_metrics()
+
+                self.put(Event(type, data))
+
+    def _schedule_timer(
+        self,
+        deadline: float,
+        type: str,
+        interval: float,
+        data: Any,
+        generation: int
+    ) -> None:
+        """
+        Push timer into schedule, should be called with timer condition acquired.
+        """
+        heappush(
+            self._timer_schedule,
+            (deadline, next(self._timer_count), type, interval, data, generation)
+        )
+        self._timer_condition.notify()
+
+    def add_timer(self, type: str, interval: float, data: Any = None) -> None:
+        """
+        Add a timer which generates event of type every interval
+        second(s). Existing timer of the same type is replaced.
+        """
+        with self._timer_condition:
+            generation: int = next(self._timer_count)
+            self._timer_generations[type] = generation
+            self._schedule_timer(monotonic() + interval, type, interval, data, generation)
+
+    def add_deadline(self, type: str, delay: float, data: Any = None) -> None:
+        """
+        Add a one-shot timer which generates event of type after delay
+        second(s). Existing timer of the same type is replaced.
+        """
+        with self._timer_condition:
+            generation: int = next(self._timer_count)
+            self._timer_generations[type] = generation
+            self._schedule_timer(monotonic() + delay, type, 0, data, generation)
+
+    def remove_timer(self, type: str) -> None:
+        """
+        Remove timer or deadline of type.
+        """
+        with self._timer_condition:
+            self._timer_generations.pop(type, None)
 
     def start(self) -> None:
         """
@@ -92,52 +517,164 @@ class EventEngine:
         self._thread.start()
         self._timer.start()
 
+        for thread in self._shard_threads:
+            thread.start()
+
     def stop(self) -> None:
         """
         Stop event engine.
         """
         self._active = False
+
+        with self._timer_condition:
+            self._timer_condition.notify()
+
         self._timer.join()
         self._thread.join()
 
+        for thread in self._shard_threads:
+            thread.join()
+
     def put(self, event: Event) -> None:
         """
         Put an event object into event queue.
         """
-        self._queue.put(event)
+        if self._conflate_prefixes and self._conflate(event):
+            return
+
+        if not self._shard_queues:
+            queue: Queue = self._queue
+        else:
+            queue = self._routes.get(event.type, None)
+            if queue is None:
+                queue = self._route(event.type)
+
+        if self._metrics:
+            event.put_time = perf_counter()
+            self._metrics.record_depth(queue.qsize() + 1)
+
+        queue.put(event)
+
+    def _route(self, type: str) -> Queue:
+        """
+        Find the queue of event type by longest matched shard prefix.
+        """
+        prefix: str = match_prefix(type, self._shard_queues.keys())
+        queue: Queue = self._shard_queues.get(prefix, self._queue)
+
+        # Avoid unlimited growth with types such as EVENT_ORDER + vt_orderid
+        if len(self._routes) >= ROUTE_CACHE_SIZE:
+            self._routes.clear()
+        self._routes[type] = queue
+
+        return queue
+
+    def _conflate(self, event: Event) -> bool:
+        """
+        Replace data of pending event with the same vt_symbol.
+        Return True if event is conflated and should not be queued.
+        """
+        conflated: Optional[bool] = self._conflate_types.get(event.type, None)
+        if conflated is None:
+            conflated = bool(match_prefix(event.type, self._conflate_prefixes))
+
+            if len(self._conflate_types) >= ROUTE_CACHE_SIZE:
+                self._conflate_types.clear()
+            self._conflate_types[event.type] = conflated
+
+        if not conflated:
+            return False
+
+        vt_symbol: Optional[str] = getattr(event.data, "vt_symbol", None)
+        if vt_symbol is None:
+            return False
+
+        key: tuple = (event.type, vt_symbol)
+
+        with self._conflate_lock:
+            pending: Optional[Event] = self._pending.get(key, None)
+            if pending:
+                pending.data = event.data
+                self._conflated_counts[vt_symbol] += 1
+                return True
+
+            event.conflate_key = key
+            self._pending[key] = event
+            return False
+
+    def _release(self, event: Event) -> None:
+        """
+        Remove event from pending dict before it is processed, so that
+        newer data will be queued as a new event.
+        """
+        key: tuple = event.conflate_key
+
+        with self._conflate_lock:
+            if self._pending.get(key, None) is event:
+                self._pending.pop(key)
+
+    def get_metrics(self) -> dict:
+        """
+        Get snapshot of metrics, empty dict if metrics not enabled.
+        """
+        if not self._metrics:
+            return {}
+        return self._metrics.get_snapshot()
+
+    def reset_metrics(self) -> None:
+        """
+        Clear recorded metrics.
+        """
+        if self._metrics:
+            self._metrics.reset()
+
+    def get_conflated_counts(self) -> Dict[str, int]:
+        """
+        Get number of events conflated for each vt_symbol.
+        """
+        with self._conflate_lock:
+            return dict(self._conflated_counts)
 
     def register(self, type: str, handler: HandlerType) -> None:
         """
         Register a new handler function for a specific event type. Every
         function can only be registered once for each event type.
         """
-        handler_list: list = self._handlers[type]
-        if handler not in handler_list:
-            handler_list.append(handler)
+        with self._handler_lock:
+            handlers: tuple = self._handlers.get(type, ())
+            if handler not in handlers:
+                self._handlers[type] = handlers + (handler,)
 
     def unregister(self, type: str, handler: HandlerType) -> None:
         """
         Unregister an existing handler function from event engine.
         """
-        handler_list: list = self._handlers[type]
-
-        if handler in handler_list:
-            handler_list.remove(handler)
+        with self._handler_lock:
+            handlers: tuple = self._handlers.get(type, ())
+            if handler not in handlers:
+                return
 
-        if not handler_list:
-            self._handlers.pop(type)
+            handlers = tuple([h for h in handlers if h != handler])
+            if handlers:
+                self._handlers[type] = handlers
+            else:
+                self._handlers.pop(type)
 
     def register_general(self, handler: HandlerType) -> None:
         """
         Register a new handler function for all event types. Every
         function can only be registered once for each event type.
         """
-        if handler not in self._general_handlers:
-            self._general_handlers.append(handler)
+        with self._handler_lock:
+            if handler not in self._general_handlers:
+                self._general_handlers = self._general_handlers + (handler,)
 
     def unregister_general(self, handler: HandlerType) -> None:
         """
         Unregister an existing general handler function.
         """
-        if handler in self._general_handlers:
-            self._general_handlers.remove(handler)
+        with self._handler_lock:
+            if handler in self._general_handlers:
+                self._general_handlers = tuple(
+                    [h for h in self._general_handlers if h != handler]
+                )
@@ -0,0 +1,145 @@
+"""
+Runtime metrics of event engine.
+"""
+
+from collections import defaultdict
+from threading import Lock
+from types import ModuleType
+from typing import Any, Callable, Dict, List
+
+# Bucket i counts samples less than 2 ** i microseconds,
+# the last bucket also counts all samples above 1 second.
+BUCKET_COUNT = 21
+
+
+def get_handler_name(handler: Callable) -> str:
+    """
+    Get name of handler for recording metrics, which includes module and
+    qualified name, and also class of the owner object for bound methods,
+    so that handlers such as signal.emit of different widgets or methods
+    inherited from a base class can be distinguished.
+    """
+    owner: Any = getattr(handler, "__self__", None)
+    qualname: str = getattr(handler, "__qualname__", None) or repr(handler)
+    module: str = getattr(handler, "__module__", None) or getattr(type(owner), "__module__", "")
+
+    name: str = f"{module}.{qualname}" if module else qualname
+
+    if owner is not None and not isinstance(owner, ModuleType):
+        owner_name: str = type(owner).__qualname__
+        if not qualname.startswith(owner_name + "."):
+            name += f"[{owner_name}]"
+
+    return name
+
+
+class Histogram:
+    """
+    Histogram of durations with power of 2 microsecond buckets.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.count: int = 0
+        self.total: float = 0
+        self.max: float = 0
+        self.buckets: List[int] = [0] * BUCKET_COUNT
+
+    def add(self, seconds: float) -> None:
+        """
+        Add a duration sample in seconds.
+        """
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+        index: int = int(seconds * 1_000_000).bit_length()
+        self.buckets[min(index, BUCKET_COUNT - 1)] += 1
+
+    def percentile(self, percent: float) -> float:
+        """
+        Get upper bound (in seconds) of the bucket where the percentile is.
+        """
+        if not self.count:
+            return 0
+
+        target: float = self.count * percent / 100
+        accumulated: int = 0
+
+        for i, n in enumerate(self.buckets):
+            accumulated += n
+            if accumulated >= target:
+                return min(2 ** i / 1_000_000, self.max)
+
+        return self.max
+
+    def to_dict(self) -> dict:
+        """
+        Convert histogram to dict with durations in seconds.
+        """
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "buckets": {
+                2 ** i / 1_000_000: n for i, n in enumerate(self.buckets) if n
+            }
+        }
+
+
+class EventMetrics:
+    """
+    Records queue wait time of each event type, execution time of
+    each handler and max depth of event queue.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self._lock: Lock = Lock()
+        self._wait_histograms: Dict[str, Histogram] = defaultdict(Histogram)
+        self._handler_histograms: Dict[str, Histogram] = defaultdict(Histogram)
+        self._max_depth: int = 0
+
+    def record_wait(self, type: str, seconds: float) -> None:
+        """
+        Record time between event put and processed.
+        """
+        with self._lock:
+            self._wait_histograms[type].add(seconds)
+
+    def record_handler(self, name: str, seconds: float) -> None:
+        """
+        Record execution time of a handler.
+        """
+        with self._lock:
+            self._handler_histograms[name].add(seconds)
+
+    def record_depth(self, depth: int) -> None:
+        """
+        Record depth of event queue.
+        """
+        if depth > self._max_depth:
+            self._max_depth = depth
+
+    def get_snapshot(self) -> dict:
+        """
+        Get all metrics as dict.
+        """
+        with self._lock:
+            return {
+                "max_depth": self._max_depth,
+                "wait": {k: v.to_dict() for k, v in self._wait_histograms.items()},
+                "handler": {k: v.to_dict() for k, v in self._handler_histograms.items()},
+            }
+
+    def reset(self) -> None:
+        """
+        Clear all recorded metrics.
+        """
+        with self._lock:
+            self._wait_histograms.clear()
+            self._handler_histograms.clear()
+            self._max_depth = 0
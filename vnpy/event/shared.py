@@ -0,0 +1,319 @@
+"""
+Cross-process event bus based on shared memory ring buffer.
+
+One publisher process writes events into a ring buffer in shared
+memory, and any number of subscriber processes read from it with
+their own cursors, so market data from one gateway connection can
+be fanned out to strategies running in other processes.
+"""
+
+import os
+import pickle
+from multiprocessing.shared_memory import SharedMemory
+from struct import Struct
+from threading import Lock, Thread
+from time import sleep
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+from .engine import Event, EventEngine, EVENT_TIMER, EVENT_METRICS
+
+# Header: committed cursor, reserved cursor, data capacity
+HEADER_STRUCT = Struct("<QQQ")
+HEADER_SIZE = 64
+
+# Record: length of payload, then payload padded to 8 bytes
+LENGTH_STRUCT = Struct("<I")
+PADDING = 0xFFFFFFFF
+
+# Generated by every engine itself, not published if types not passed
+LOCAL_TYPES = {EVENT_TIMER, EVENT_METRICS}
+
+
+def _align(size: int) -> int:
+    """
+    Align size to 8 bytes.
+    """
+    return (size + 7) & ~7
+
+
+def _attach(name: str) -> SharedMemory:
+    """
+    Attach to existing shared memory without letting resource tracker
+    of this process unlink it when exiting.
+    """
+    # Python 3.13+
+    try:
+        return SharedMemory(name, track=False)
+    except TypeError:
+        pass
+
+    if os.name != "posix":
+        return SharedMemory(name)
+
+    from multiprocessing import resource_tracker
+
+    # Tracker inherited from parent process is shared with publisher,
+    # only unregister from the one started by attaching here.
+    started: bool = resource_tracker._resource_tracker._fd is not None
+    shm: SharedMemory = SharedMemory(name)
+
+    if not started:
+        resource_tracker.unregister(shm._name, "shared_memory")
+
+    return shm
+
+
+class RingBuffer:
+    """
+    Single producer multi consumer ring buffer in shared memory.
+
+    Cursors are absolute byte positions which only grow. Writer first
+    reserves the range it is going to write, then copies the record and
+    commits. Reader checks the reserved cursor after reading a record,
+    if the writer has lapped the record, the read is discarded.
+    """
+
+    def __init__(self, name: str, capacity: int = 0) -> None:
+        """
+        Create shared memory if capacity is passed, otherwise attach
+        to an existing one.
+        """
+        if capacity:
+            capacity = _align(capacity)
+            self.shm: SharedMemory = SharedMemory(name, create=True, size=HEADER_SIZE + capacity)
+            HEADER_STRUCT.pack_into(self.shm.buf, 0, 0, 0, capacity)
+            self.owner: bool = True
+        else:
+            self.shm = _attach(name)
+            self.owner = False
+
+        self.buf: memoryview = self.shm.buf
+        self.capacity: int = HEADER_STRUCT.unpack_from(self.buf, 0)[2]
+
+    def get_cursors(self) -> Tuple[int, int]:
+        """
+        Get committed and reserved cursor of writer.
+        """
+        committed, reserved, _ = HEADER_STRUCT.unpack_from(self.buf, 0)
+        return committed, reserved
+
+    def write(self, payload: bytes) -> None:
+        """
+        Write a record into buffer.
+        """
+        size: int = _align(LENGTH_STRUCT.size + len(payload))
+        if size > self.capacity:
+            raise ValueError(f"Record size {size} exceeds buffer capacity {self.capacity}")
+
+        cursor, _ = self.get_cursors()
+        offset: int = cursor % self.capacity
+
+        # Skip the tail if the record does not fit in it
+        if offset + size > self.capacity:
+            end: int = cursor + self.capacity - offset + size
+            HEADER_STRUCT.pack_into(self.buf, 0, cursor, end, self.capacity)
+
+            LENGTH_STRUCT.pack_into(self.buf, HEADER_SIZE + offset, PADDING)
+            cursor += self.capacity - offset
+            offset = 0
+        else:
+            end = cursor + size
+            HEADER_STRUCT.pack_into(self.buf, 0, cursor, end, self.capacity)
+
+        start: int = HEADER_SIZE + offset + LENGTH_STRUCT.size
+        LENGTH_STRUCT.pack_into(self.buf, HEADER_SIZE + offset, len(payload))
+        self.buf[start:start + len(payload)] = payload
+
+        HEADER_STRUCT.pack_into(self.buf, 0, end, end, self.capacity)
+
+    def read(self, cursor: int) -> Tuple[Optional[memoryview], int]:
+        """
+        Read the record at cursor without copying.
+
+        Return view of payload (None for padding) and cursor of next record.
+        The view must be checked by is_valid after being consumed.
+        """
+        offset: int = cursor % self.capacity
+        length: int = LENGTH_STRUCT.unpack_from(self.buf, HEADER_SIZE + offset)[0]
+
+        if length == PADDING:
+            return None, cursor + self.capacity - offset
+
+        start: int = HEADER_SIZE + offset + LENGTH_STRUCT.size
+        view: memoryview = self.buf[start:start + length]
+        return view, cursor + _align(LENGTH_STRUCT.size + length)
+
+    def is_valid(self, cursor: int) -> bool:
+        """
+        Check if the record at cursor has not been overwritten by writer.
+        """
+        _, reserved = self.get_cursors()
+        return reserved - cursor <= self.capacity
+
+    def close(self) -> None:
+        """
+        Close shared memory, and unlink it if owned.
+        """
+        self.shm.close()
+
+        if self.owner:
+            self.shm.unlink()
+
+
+class SharedEventPublisher:
+    """
+    Publish events of local event engine into shared memory.
+    """
+
+    def __init__(
+        self,
+        event_engine: EventEngine,
+        name: str,
+        types: Sequence[str] = None,
+        capacity: int = 64 * 1024 * 1024,
+        dumps: Callable[[Any], bytes] = None
+    ) -> None:
+        """
+        Events of types are published, or all events except timer and
+        metrics events (which subscriber engine generates by itself)
+        if types not passed.
+
+        Events are serialized with pickle, if dumps function not passed.
+        Events failed to be serialized or too large for the buffer are
+        dropped and counted.
+        """
+        self.event_engine: EventEngine = event_engine
+        self.types: Sequence[str] = types or []
+        self.dumps: Optional[Callable[[Any], bytes]] = dumps
+
+        self.ring: RingBuffer = RingBuffer(name, capacity)
+        self.lock: Lock = Lock()
+        self.dropped: int = 0
+
+    def start(self) -> None:
+        """
+        Start publishing events.
+        """
+        if self.types:
+            for type in self.types:
+                self.event_engine.register(type, self.process_event)
+        else:
+            self.event_engine.register_general(self.process_event)
+
+    def process_event(self, event: Event) -> None:
+        """
+        Write event into ring buffer.
+        """
+        if not self.types and event.type in LOCAL_TYPES:
+            return
+
+        item: tuple = (event.type, event.data, event.subtype)
+
+        # Exception should not stop the thread of event engine
+        try:
+            if self.dumps:
+                payload: bytes = self.dumps(item)
+            else:
+                payload = pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+
+            # Handlers may run on different threads if engine is sharded
+            with self.lock:
+                self.ring.write(payload)
+        except Exception:
+            with self.lock:
+                self.dropped += 1
+
+    def close(self) -> None:
+        """
+        Stop publishing and release shared memory.
+        """
+        if self.types:
+            for type in self.types:
+                self.event_engine.unregister(type, self.process_event)
+        else:
+            self.event_engine.unregister_general(self.process_event)
+
+        self.ring.close()
+
+
+class SharedEventSubscriber:
+    """
+    Read events from shared memory and put them into local event engine.
+    """
+
+    def __init__(
+        self,
+        event_engine: EventEngine,
+        name: str,
+        poll_interval: float = 0.001,
+        loads: Callable[[bytes], Any] = pickle.loads
+    ) -> None:
+        """
+        The loads function should match dumps function of publisher.
+        """
+        self.event_engine: EventEngine = event_engine
+        self.poll_interval: float = poll_interval
+        self.loads: Callable[[bytes], Any] = loads
+
+        self.ring: RingBuffer = RingBuffer(name)
+        self.cursor: int = 0
+        self.dropped: int = 0
+
+        self.active: bool = False
+        self.thread: Thread = Thread(target=self.run)
+
+    def start(self) -> None:
+        """
+        Start reading events published from now on.
+        """
+        self.cursor, _ = self.ring.get_cursors()
+
+        self.active = True
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop reading and detach from shared memory.
+        """
+        self.active = False
+        self.thread.join()
+        self.ring.close()
+
+    def run(self) -> None:
+        """
+        Poll ring buffer for new records.
+        """
+        while self.active:
+            committed, _ = self.ring.get_cursors()
+
+            if self.cursor == committed:
+                sleep(self.poll_interval)
+                continue
+
+            # Reader lapped by writer, skip to latest position
+            if not self.ring.is_valid(self.cursor):
+                self.dropped += 1
+                self.cursor = committed
+                continue
+
+            view, next_cursor = self.ring.read(self.cursor)
+
+            if view is not None:
+                # Record may be corrupted if overwritten during reading
+                try:
+                    item: Optional[tuple] = self.loads(view)
+                except Exception:
+                    item = None
+                finally:
+                    view.release()
+
+                if not self.ring.is_valid(self.cursor):
+                    self.dropped += 1
+                    self.cursor = self.ring.get_cursors()[0]
+                    continue
+
+                if item:
+                    type, data, subtype = item
+                    self.event_engine.put(Event(type, data, subtype))
+
+            self.cursor = next_cursor
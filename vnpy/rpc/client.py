@@ -1,7 +1,8 @@
+import pickle
 import threading
 from time import time
 from functools import lru_cache
-from typing import Any
+from typing import Any, Callable
 
 import zmq
 
@@ -29,8 +30,20 @@ class RemoteException(Exception):
 class RpcClient:
     """"""
 
-    def __init__(self) -> None:
-        """Constructor"""
+    def __init__(
+        self,
+        dumps: Callable[[Any], bytes] = pickle.dumps,
+        loads: Callable[[bytes], Any] = pickle.loads
+    ) -> None:
+        """
+        Constructor, objects are serialized with pickle by default,
+        otherwise by dumps and loads functions passed (which should
+        be the same as used by server, e.g. vnpy.trader.codec).
+        """
+        # Serialization functions of messages
+        self._dumps: Callable[[Any], bytes] = dumps
+        self._loads: Callable[[bytes], Any] = loads
+
         # zmq port related
         self._context: zmq.Context = zmq.Context()
 
@@ -70,7 +83,7 @@ class RpcClient:
 
             # Send request and wait for response
             with self._lock:
-                self._socket_req.send_pyobj(req)
+                self._socket_req.send(self._dumps(req))
 
                 # Timeout reached without any data
                 n: int = self._socket_req.poll(timeout)
@@ -78,7 +91,7 @@ class RpcClient:
                     msg: str = f"Timeout of {timeout}ms reached for {req}"
                     raise RemoteException(msg)
 
-                rep = self._socket_req.recv_pyobj()
+                rep = self._loads(self._socket_req.recv())
 
             # Return response if successed; Trigger exception if failed
             if rep[0]:
@@ -140,7 +153,7 @@ class RpcClient:
                 continue
 
             # Receive data from subscribe socket
-            topic, data = self._socket_sub.recv_pyobj(flags=zmq.NOBLOCK)
+            topic, data = self._loads(self._socket_sub.recv(flags=zmq.NOBLOCK))
 
             if topic == HEARTBEAT_TOPIC:
                 self._last_received_ping = data
@@ -1,3 +1,4 @@
+import pickle
 import threading
 import traceback
 from time import time
@@ -11,10 +12,20 @@ from .common import HEARTBEAT_TOPIC, HEARTBEAT_INTERVAL
 class RpcServer:
     """"""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        dumps: Callable[[Any], bytes] = pickle.dumps,
+        loads: Callable[[bytes], Any] = pickle.loads
+    ) -> None:
         """
-        Constructor
+        Constructor, objects are serialized with pickle by default,
+        otherwise by dumps and loads functions passed (which should
+        be the same as used by client, e.g. vnpy.trader.codec).
         """
+        # Serialization functions of messages
+        self._dumps: Callable[[Any], bytes] = dumps
+        self._loads: Callable[[bytes], Any] = loads
+
         # Save functions dict: key is function name, value is function object
         self._functions: Dict[str, Callable] = {}
 
@@ -93,7 +104,7 @@ class RpcServer:
                 continue
 
             # Receive request data from Reply socket
-            req = self._socket_rep.recv_pyobj()
+            req = self._loads(self._socket_rep.recv())
 
             # Get function name and parameters
             name, args, kwargs = req
@@ -107,7 +118,7 @@ class RpcServer:
                 rep: list = [False, traceback.format_exc()]
 
             # send callable response by Reply socket
-            self._socket_rep.send_pyobj(rep)
+            self._socket_rep.send(self._dumps(rep))
 
         # Unbind socket address
         self._socket_pub.unbind(self._socket_pub.LAST_ENDPOINT)
@@ -118,7 +129,7 @@ class RpcServer:
         Publish data
         """
         with self._lock:
-            self._socket_pub.send_pyobj([topic, data])
+            self._socket_pub.send(self._dumps([topic, data]))
 
     def register(self, func: Callable) -> None:
         """
@@ -0,0 +1,422 @@
+"""
+Compact binary codec for data objects of the trading platform.
+
+Each data class in vnpy.trader.object is encoded by a schema generated
+from its dataclass fields:
+    * float/int/bool as fixed size numbers
+    * enum as index of member in definition order
+    * datetime as int64 nanoseconds of wall clock time, with UTC offset minutes
+    * str as length prefixed UTF-8 bytes
+    * None of any field is marked in a null bitmap
+
+Lists, tuples and strings containing data objects are also encoded,
+as well as events (type, subtype and then data), while any other object
+(or data object with field of unexpected type) falls back to pickle.
+
+Notice:
+1. class ids and enum indexes depend on definition order, so both sides
+   should run the same version of vnpy.
+2. timezone of datetime is decoded as fixed offset timezone.
+"""
+
+import pickle
+from dataclasses import fields
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from struct import Struct, error as struct_error
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from vnpy.event import Event
+
+from .object import (
+    TickData,
+    BarData,
+    OrderData,
+    TradeData,
+    PositionData,
+    AccountData,
+    LogData,
+    ContractData,
+    QuoteData,
+    SubscribeRequest,
+    OrderRequest,
+    CancelRequest,
+    HistoryRequest,
+    QuoteRequest,
+    CompactTickData,
+    CompactBarData
+)
+from .pool import PooledTickData
+
+# Only append new classes at the end to keep class ids unchanged.
+CODEC_CLASSES: List[type] = [
+    TickData,
+    BarData,
+    OrderData,
+    TradeData,
+    PositionData,
+    AccountData,
+    LogData,
+    ContractData,
+    QuoteData,
+    SubscribeRequest,
+    OrderRequest,
+    CancelRequest,
+    HistoryRequest,
+    QuoteRequest,
+    CompactTickData,
+    CompactBarData
+]
+
+# Attributes set in __post_init__ which can not be recalculated.
+POST_ATTRIBUTES: Dict[type, List[Tuple[str, type]]] = {
+    LogData: [("time", datetime)]
+}
+
+TAG_NONE = 0
+TAG_OBJECT = 1
+TAG_STR = 2
+TAG_LIST = 3
+TAG_TUPLE = 4
+TAG_PICKLE = 5
+TAG_EVENT = 6
+
+HEADER_STRUCT = Struct("<BB")
+LENGTH_STRUCT = Struct("<I")
+
+EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+ONE_MINUTE = timedelta(minutes=1)
+NAIVE_OFFSET = -32768
+
+timezones: Dict[int, timezone] = {}
+
+
+def get_timezone(offset: int) -> Optional[timezone]:
+    """
+    Get cached fixed offset timezone of UTC offset minutes.
+    """
+    if offset == NAIVE_OFFSET:
+        return None
+
+    tz: Optional[timezone] = timezones.get(offset, None)
+    if not tz:
+        tz = timezone(timedelta(minutes=offset))
+        timezones[offset] = tz
+    return tz
+
+
+def get_sample(type_: type) -> Any:
+    """
+    Get sample value of field type for checking schema.
+    """
+    if type_ is float:
+        return 1.5
+    if type_ is int:
+        return 7
+    if type_ is bool:
+        return True
+    if type_ is str:
+        return "s"
+    if type_ is datetime:
+        return datetime(2024, 1, 2, 3, 4, 5, 6, get_timezone(480))
+    if isinstance(type_, type) and issubclass(type_, Enum):
+        return list(type_)[-1]
+    return {"key": [1]}
+
+
+class Schema:
+    """
+    Encoder and decoder of one data class, generated from its fields.
+    """
+
+    def __init__(self, class_id: int, data_class: type) -> None:
+        """"""
+        self.class_id: int = class_id
+        self.data_class: type = data_class
+
+        items: List[Tuple[str, type, bool]] = [
+            (f.name, f.type, f.init) for f in fields(data_class)
+        ]
+        for name, type_ in POST_ATTRIBUTES.get(data_class, []):
+            items.append((name, type_, False))
+
+        if len(items) > 64:
+            raise ValueError(f"Too many fields of {data_class.__name__} for null bitmap")
+
+        self.encode: Callable[[Any], bytes] = None
+        self.decode: Callable[[bytes, int], Tuple[Any, int]] = None
+        self._generate(items)
+        self._check(items)
+
+    def _check(self, items: List[Tuple[str, type, bool]]) -> None:
+        """
+        Check that sample object is decoded with the same value and type of each field.
+        """
+        values: Dict[str, Any] = {name: get_sample(type_) for name, type_, _ in items}
+
+        obj: Any = self.data_class(**{name: values[name] for name, _, init in items if init})
+        for name, _, init in items:
+            if not init:
+                setattr(obj, name, values[name])
+
+        result, _ = self.decode(self.encode(obj), 0)
+
+        for name, _, _ in items:
+            value: Any = getattr(result, name)
+            if type(value) is not type(values[name]) or value != values[name]:
+                raise TypeError(
+                    f"Field {name} of {self.data_class.__name__} decoded as {value!r}, "
+                    f"expected {values[name]!r}"
+                )
+
+    def _generate(self, items: List[Tuple[str, type, bool]]) -> None:
+        """
+        Generate encode and decode functions of the fields.
+        """
+        fmt: str = "<BBQ"
+        namespace: dict = {
+            "pack": None,
+            "unpack_from": None,
+            "size": 0,
+            "dumps": pickle.dumps,
+            "loads": pickle.loads,
+            "EPOCH": EPOCH,
+            "ONE_MICROSECOND": ONE_MICROSECOND,
+            "ONE_MINUTE": ONE_MINUTE,
+            "NAIVE_OFFSET": NAIVE_OFFSET,
+            "timedelta": timedelta,
+            "get_timezone": get_timezone,
+            "data_class": self.data_class,
+        }
+
+        encode_lines: List[str] = ["def encode(obj):", "    nulls = 0"]
+        pack_args: List[str] = [str(TAG_OBJECT), str(self.class_id), "nulls"]
+        blob_names: List[str] = []
+
+        decode_lines: List[str] = [
+            "def decode(data, offset):",
+            "    values = unpack_from(data, offset)",
+            "    nulls = values[2]",
+            "    pos = offset + size",
+        ]
+        init_args: List[str] = []
+        post_lines: List[str] = []
+
+        index: int = 3
+
+        for i, (name, type_, init) in enumerate(items):
+            bit: int = 1 << i
+            var: str = f"v{i}"
+
+            encode_lines.append(f"    {var} = obj.{name}")
+            encode_lines.append(f"    if {var} is None:")
+            encode_lines.append(f"        nulls |= {bit}")
+
+            null_check: str = f"None if nulls & {bit} else "
+
+            if type_ is float or type_ is int or type_ is bool:
+                # Object with int field of other type is pickled, as packing raises error
+                fmt += {float: "d", int: "q", bool: "?"}[type_]
+                encode_lines.append(f"        {var} = 0")
+                pack_args.append(var)
+
+                value: str = f"{null_check}values[{index}]"
+                index += 1
+
+            elif isinstance(type_, type) and issubclass(type_, Enum):
+                members: list = list(type_)
+                namespace[f"members{i}"] = members
+                namespace[f"indexes{i}"] = {id(m): n for n, m in enumerate(members)}
+
+                fmt += "B"
+                encode_lines.append(f"        {var} = 0")
+                encode_lines.append("    else:")
+                encode_lines.append(f"        {var} = indexes{i}[id({var})]")
+                pack_args.append(var)
+
+                value = f"{null_check}members{i}[values[{index}]]"
+                index += 1
+
+            elif type_ is datetime:
+                fmt += "qh"
+                encode_lines.append(f"        {var}_ns = 0")
+                encode_lines.append(f"        {var}_offset = 0")
+                encode_lines.append("    else:")
+                encode_lines.append(f"        {var}_ns = ({var}.replace(tzinfo=None) - EPOCH) // ONE_MICROSECOND * 1000")
+                encode_lines.append(f"        {var}_utcoffset = {var}.utcoffset()")
+                encode_lines.append(f"        if {var}_utcoffset is None:")
+                encode_lines.append(f"            {var}_offset = NAIVE_OFFSET")
+                encode_lines.append("        else:")
+                encode_lines.append(f"            {var}_offset = {var}_utcoffset // ONE_MINUTE")
+                pack_args.extend([f"{var}_ns", f"{var}_offset"])
+
+                value = (
+                    f"{null_check}(EPOCH + timedelta(microseconds=values[{index}] // 1000))"
+                    f".replace(tzinfo=get_timezone(values[{index + 1}]))"
+                )
+                index += 2
+
+            else:
+                # str is encoded as UTF-8, other types are pickled
+                fmt += "I"
+                encode_lines.append(f"        {var}_bytes = b''")
+                encode_lines.append("    else:")
+                if type_ is str:
+                    encode_lines.append(f"        {var}_bytes = {var}.encode()")
+                else:
+                    encode_lines.append(f"        {var}_bytes = dumps({var}, -1)")
+                pack_args.append(f"len({var}_bytes)")
+                blob_names.append(f"{var}_bytes")
+
+                decode_lines.append(f"    end = pos + values[{index}]")
+                if type_ is str:
+                    decode_lines.append(f"    {var} = {null_check}str(data[pos:end], 'utf-8')")
+                else:
+                    decode_lines.append(f"    {var} = {null_check}loads(data[pos:end])")
+                decode_lines.append("    pos = end")
+
+                value = var
+                index += 1
+
+            if init:
+                init_args.append(f"{name}={value}")
+            else:
+                # Attribute not set in __init__ is kept unset if None
+                post_lines.append(f"    if not nulls & {bit}:")
+                post_lines.append(f"        obj.{name} = {value}")
+
+        struct: Struct = Struct(fmt)
+        namespace["pack"] = struct.pack
+        namespace["unpack_from"] = struct.unpack_from
+        namespace["size"] = struct.size
+
+        encode_lines.append(
+            f"    return b''.join([pack({', '.join(pack_args)}), {', '.join(blob_names)}])"
+        )
+
+        decode_lines.append(f"    obj = data_class({', '.join(init_args)})")
+        decode_lines.extend(post_lines)
+        decode_lines.append("    return obj, pos")
+
+        # Tag and class id are unpacked with fields but skipped in decoding
+        source: str = "\n".join(encode_lines) + "\n\n" + "\n".join(decode_lines) + "\n"
+        exec(source, namespace)
+
+        self.encode = namespace["encode"]
+        self.decode = namespace["decode"]
+
+
+schemas: Dict[type, Schema] = {}
+schema_list: List[Schema] = []
+
+for n, cls in enumerate(CODEC_CLASSES):
+    schema: Schema = Schema(n, cls)
+    schemas[cls] = schema
+    schema_list.append(schema)
+
+# Pooled tick is decoded as plain tick data
+schemas[PooledTickData] = schemas[TickData]
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode object into bytes.
+    """
+    schema: Optional[Schema] = schemas.get(type(obj), None)
+    if schema:
+        return b"".join(_encode_object(schema, obj))
+
+    return b"".join(_encode_parts(obj))
+
+
+def _encode_object(schema: Schema, obj: Any) -> List[bytes]:
+    """
+    Encode data object by schema, or by pickle if any field has unexpected type.
+    """
+    try:
+        return [schema.encode(obj)]
+    except (TypeError, AttributeError, KeyError, struct_error):
+        data: bytes = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+        return [bytes([TAG_PICKLE]), LENGTH_STRUCT.pack(len(data)), data]
+
+
+def _encode_parts(obj: Any) -> List[bytes]:
+    """
+    Encode object into list of bytes with tag.
+    """
+    schema: Optional[Schema] = schemas.get(type(obj), None)
+    if schema:
+        return _encode_object(schema, obj)
+
+    if obj is None:
+        return [bytes([TAG_NONE])]
+
+    obj_type: type = type(obj)
+
+    if obj_type is str:
+        data: bytes = obj.encode()
+        return [bytes([TAG_STR]), LENGTH_STRUCT.pack(len(data)), data]
+
+    if obj_type is list or obj_type is tuple:
+        tag: int = TAG_LIST if obj_type is list else TAG_TUPLE
+        parts: List[bytes] = [bytes([tag]), LENGTH_STRUCT.pack(len(obj))]
+        for item in obj:
+            parts.extend(_encode_parts(item))
+        return parts
+
+    if obj_type is Event:
+        parts = [bytes([TAG_EVENT])]
+        parts.extend(_encode_parts(obj.type))
+        parts.extend(_encode_parts(obj.subtype))
+        parts.extend(_encode_parts(obj.data))
+        return parts
+
+    data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+    return [bytes([TAG_PICKLE]), LENGTH_STRUCT.pack(len(data)), data]
+
+
+def loads(data: bytes) -> Any:
+    """
+    Decode object from bytes.
+    """
+    obj, _ = _decode(data, 0)
+    return obj
+
+
+def _decode(data: bytes, pos: int) -> Tuple[Any, int]:
+    """
+    Decode object at pos, return object and position after it.
+    """
+    tag: int = data[pos]
+
+    if tag == TAG_OBJECT:
+        schema: Schema = schema_list[data[pos + 1]]
+        return schema.decode(data, pos)
+
+    if tag == TAG_NONE:
+        return None, pos + 1
+
+    if tag == TAG_EVENT:
+        event_type, pos = _decode(data, pos + 1)
+        subtype, pos = _decode(data, pos)
+        event_data, pos = _decode(data, pos)
+        return Event(event_type, event_data, subtype), pos
+
+    length: int = LENGTH_STRUCT.unpack_from(data, pos + 1)[0]
+    pos += 1 + LENGTH_STRUCT.size
+
+    if tag == TAG_STR:
+        return str(data[pos:pos + length], "utf-8"), pos + length
+
+    if tag == TAG_PICKLE:
+        return pickle.loads(data[pos:pos + length]), pos + length
+
+    items: list = []
+    for _ in range(length):
+        item, pos = _decode(data, pos)
+        items.append(item)
+
+    if tag == TAG_TUPLE:
+        return tuple(items), pos
+    return items, pos
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from importlib import import_module
 
 from .constant import Interval, Exchange
-from .object import BarData, TickData
+from .object import BarData, TickData, BarBatch, TickBatch
 from .setting import SETTINGS
 from .utility import ZoneInfo
 from .locale import _
@@ -96,6 +96,35 @@ class BaseDatabase(ABC):
         """
         pass
 
+    def load_bar_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> BarBatch:
+        """
+        Load bar data from database as columnar batch.
+        Database implementations can override it to avoid creating BarData.
+        """
+        bars: List[BarData] = self.load_bar_data(symbol, exchange, interval, start, end)
+        return BarBatch.from_list(bars)
+
+    def load_tick_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> TickBatch:
+        """
+        Load tick data from database as columnar batch.
+        Database implementations can override it to avoid creating TickData.
+        """
+        ticks: List[TickData] = self.load_tick_data(symbol, exchange, start, end)
+        return TickBatch.from_list(ticks)
+
     @abstractmethod
     def delete_bar_data(
         self,
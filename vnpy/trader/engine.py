@@ -3,12 +3,14 @@ from logging import Logger
 import smtplib
 import os
 from abc import ABC
+from functools import partial
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, time, timedelta
+from time import time as get_time
 from email.message import EmailMessage
 from queue import Empty, Queue
-from threading import Thread
-from typing import Any, Type, Dict, List, Optional
+from threading import Lock, Thread
+from typing import Any, Callable, Type, Dict, List, Optional
 
 from vnpy.event import Event, EventEngine
 from .app import BaseApp
@@ -20,7 +22,9 @@ from .event import (
     EVENT_ACCOUNT,
     EVENT_CONTRACT,
     EVENT_LOG,
-    EVENT_QUOTE
+    EVENT_QUOTE,
+    EVENT_BAR,
+    EVENT_BAR_FLUSH
 )
 from .gateway import BaseGateway
 from .object import (
@@ -41,7 +45,8 @@ from .object import (
     Exchange
 )
 from .setting import SETTINGS
-from .utility import get_folder_path, TRADER_DIR
+from .constant import Interval
+from .utility import get_folder_path, BarGenerator, TRADER_DIR
 from .converter import OffsetConverter
 from .locale import _
 
@@ -110,6 +115,7 @@ class MainEngine:
         self.add_engine(LogEngine)
         self.add_engine(OmsEngine)
         self.add_engine(EmailEngine)
+        self.add_engine(BarEngine)
 
     def write_log(self, msg: str, source: str = "") -> None:
         """
@@ -672,3 +678,191 @@ class EmailEngine(BaseEngine):
 
         self.active = False
         self.thread.join()
+
+
+class BarEngine(BaseEngine):
+    """
+    Provides bar generation shared by all subscribers.
+
+    Ticks of each vt_symbol are aggregated into 1 minute bars only once,
+    which are then aggregated into bars of each window and interval
+    subscribed. Bars are published as bar event with subtype of the key
+    returned by get_bar_key.
+
+    If bar.flush is enabled in settings, minute bars are also finished
+    bar.flush_delay second(s) after the minute ends, without waiting for
+    tick of the next minute. Ticks of flushed minute arriving late are
+    ignored, and their volume is counted into the next bar.
+    """
+
+    def __init__(self, main_engine: MainEngine, event_engine: EventEngine) -> None:
+        """"""
+        super(BarEngine, self).__init__(main_engine, event_engine, "bar")
+
+        self.generators: Dict[str, BarGenerator] = {}
+        self.window_generators: Dict[str, Dict[str, BarGenerator]] = {}
+        self.handlers: Dict[str, List[Callable]] = {}
+
+        self.flush: bool = SETTINGS["bar.flush"]
+        self.flush_delay: float = SETTINGS["bar.flush_delay"]
+        self.flush_times: Dict[str, datetime] = {}
+
+        # Tick and flush events may be processed by different threads if sharded
+        self.lock: Lock = Lock()
+
+        self.add_function()
+        self.register_event()
+
+        if self.flush:
+            self.schedule_flush()
+
+    def add_function(self) -> None:
+        """Add bar subscription function to main engine."""
+        self.main_engine.subscribe_bar = self.subscribe_bar
+        self.main_engine.unsubscribe_bar = self.unsubscribe_bar
+
+    def register_event(self) -> None:
+        """"""
+        self.event_engine.register(EVENT_TICK, self.process_tick_event)
+        self.event_engine.register(EVENT_BAR_FLUSH, self.process_flush_event)
+
+    def process_tick_event(self, event: Event) -> None:
+        """"""
+        tick: TickData = event.data
+
+        generator: Optional[BarGenerator] = self.generators.get(tick.vt_symbol, None)
+        if not generator:
+            return
+
+        with self.lock:
+            # Filter tick of minute already flushed
+            flush_time: Optional[datetime] = self.flush_times.get(tick.vt_symbol, None)
+            if flush_time and tick.datetime < flush_time:
+                return
+
+            generator.update_tick(tick)
+
+    def process_flush_event(self, event: Event) -> None:
+        """
+        Finish minute bars whose minute has ended.
+        """
+        self.schedule_flush()
+
+        with self.lock:
+            for vt_symbol, generator in list(self.generators.items()):
+                bar: Optional[BarData] = generator.bar
+                if not bar:
+                    continue
+
+                end: datetime = bar.datetime.replace(second=0, microsecond=0) + timedelta(minutes=1)
+                if datetime.now(end.tzinfo) >= end:
+                    generator.generate()
+                    self.flush_times[vt_symbol] = end
+
+    def schedule_flush(self) -> None:
+        """
+        Schedule flush event after the next minute ends.
+        """
+        delay: float = 60 - get_time() % 60 + self.flush_delay
+        self.event_engine.add_deadline(EVENT_BAR_FLUSH, delay)
+
+    def subscribe_bar(
+        self,
+        vt_symbol: str,
+        handler: Callable[[Event], None],
+        window: int = 1,
+        interval: Interval = Interval.MINUTE,
+        daily_end: time = None
+    ) -> str:
+        """
+        Register handler for bar event of vt_symbol with window and interval,
+        daily_end is required for daily bar. Return key of the bars.
+        """
+        key: str = get_bar_key(vt_symbol, window, interval)
+
+        if vt_symbol not in self.generators:
+            self.generators[vt_symbol] = BarGenerator(self.on_bar)
+            self.window_generators[vt_symbol] = {}
+
+        window_generators: Dict[str, BarGenerator] = self.window_generators[vt_symbol]
+        if not self.is_minute_bar(window, interval) and key not in window_generators:
+            generator: BarGenerator = BarGenerator(
+                self.on_bar,
+                window,
+                partial(self.put_bar_event, key),
+                interval,
+                daily_end
+            )
+            # Copy on write since dict is iterated in event thread
+            self.window_generators[vt_symbol] = {**window_generators, key: generator}
+
+        handlers: List[Callable] = self.handlers.setdefault(key, [])
+        if handler not in handlers:
+            handlers.append(handler)
+            self.event_engine.register(EVENT_BAR + key, handler)
+
+        return key
+
+    def unsubscribe_bar(
+        self,
+        vt_symbol: str,
+        handler: Callable[[Event], None],
+        window: int = 1,
+        interval: Interval = Interval.MINUTE
+    ) -> None:
+        """
+        Unregister handler, and stop generating bars no longer subscribed.
+        """
+        key: str = get_bar_key(vt_symbol, window, interval)
+
+        handlers: List[Callable] = self.handlers.get(key, [])
+        if handler not in handlers:
+            return
+
+        handlers.remove(handler)
+        self.event_engine.unregister(EVENT_BAR + key, handler)
+
+        if handlers:
+            return
+        self.handlers.pop(key)
+
+        window_generators: Dict[str, BarGenerator] = {
+            k: v for k, v in self.window_generators[vt_symbol].items() if k != key
+        }
+        self.window_generators[vt_symbol] = window_generators
+
+        minute_key: str = get_bar_key(vt_symbol, 1, Interval.MINUTE)
+        if not window_generators and minute_key not in self.handlers:
+            self.generators.pop(vt_symbol)
+            self.window_generators.pop(vt_symbol)
+            self.flush_times.pop(vt_symbol, None)
+
+    def on_bar(self, bar: BarData) -> None:
+        """
+        Publish 1 minute bar and update it into window generators.
+        """
+        key: str = get_bar_key(bar.vt_symbol, 1, Interval.MINUTE)
+        if key in self.handlers:
+            self.put_bar_event(key, bar)
+
+        window_generators: Optional[Dict[str, BarGenerator]] = self.window_generators.get(bar.vt_symbol, None)
+        if window_generators:
+            for generator in window_generators.values():
+                generator.update_bar(bar)
+
+    def put_bar_event(self, key: str, bar: BarData) -> None:
+        """"""
+        event: Event = Event(EVENT_BAR, bar, key)
+        self.event_engine.put(event)
+
+    @staticmethod
+    def is_minute_bar(window: int, interval: Interval) -> bool:
+        """"""
+        return window == 1 and interval == Interval.MINUTE
+
+
+def get_bar_key(vt_symbol: str, window: int, interval: Interval) -> str:
+    """
+    Get key of bars of vt_symbol with window and interval, e.g. rb2501.SHFE.5.1m
+    """
+    return f"{vt_symbol}.{window}.{interval.value}"
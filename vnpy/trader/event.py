@@ -2,7 +2,7 @@
 Event type string used in the trading platform.
 """
 
-from vnpy.event import EVENT_TIMER  # noqa
+from vnpy.event import EVENT_TIMER, EVENT_METRICS  # noqa
 
 EVENT_TICK = "eTick."
 EVENT_TRADE = "eTrade."
@@ -12,3 +12,23 @@ EVENT_ACCOUNT = "eAccount."
 EVENT_QUOTE = "eQuote."
 EVENT_CONTRACT = "eContract."
 EVENT_LOG = "eLog"
+EVENT_BAR = "eBar."
+EVENT_BAR_FLUSH = "eBarFlush"
+
+# Priority levels for EventEngine priority lanes, lower is more urgent.
+# Contract is processed with orders so that it is always known before
+# the orders and positions pushed after it (e.g. by OffsetConverter).
+EVENT_PRIORITIES = {
+    EVENT_TRADE: 0,
+    EVENT_ORDER: 0,
+    EVENT_QUOTE: 0,
+    EVENT_CONTRACT: 0,
+    EVENT_POSITION: 1,
+    EVENT_ACCOUNT: 1,
+    EVENT_TICK: 2,
+    EVENT_BAR: 2,
+    EVENT_BAR_FLUSH: 2,
+    EVENT_LOG: 3,
+    EVENT_TIMER: 3,
+    EVENT_METRICS: 3,
+}
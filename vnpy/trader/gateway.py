@@ -30,6 +30,7 @@ from .object import (
     Exchange,
     BarData
 )
+from .pool import TickPool
 
 
 class BaseGateway(ABC):
@@ -67,6 +68,9 @@ class BaseGateway(ABC):
     So if you use a cache to store reference of data, use copy.copy to create a new object
     before passing that data into on_xxxx
 
+    The only exception is pooled tick mode enabled by tick_pool_size, in which
+        tick objects acquired from self.tick_pool are recycled by the pool, see
+        vnpy.trader.pool for details.
 
 
     """
@@ -80,65 +84,66 @@ class BaseGateway(ABC):
     # Exchanges supported in the gateway.
     exchanges: List[Exchange] = []
 
+    # Number of recycled tick objects of each symbol, 0 to disable pooling.
+    tick_pool_size: int = 0
+
     def __init__(self, event_engine: EventEngine, gateway_name: str) -> None:
         """"""
         self.event_engine: EventEngine = event_engine
         self.gateway_name: str = gateway_name
 
-    def on_event(self, type: str, data: Any = None) -> None:
+        self.tick_pool: Optional[TickPool] = None
+        if self.tick_pool_size:
+            self.tick_pool = TickPool(gateway_name, self.tick_pool_size)
+
+    def on_event(self, type: str, data: Any = None, subtype: str = "") -> None:
         """
         General event push.
         """
-        event: Event = Event(type, data)
+        event: Event = Event(type, data, subtype)
         self.event_engine.put(event)
 
     def on_tick(self, tick: TickData) -> None:
         """
         Tick event push.
-        Tick event of a specific vt_symbol is also pushed.
+        Handlers of tick event of a specific vt_symbol are also called.
         """
-        self.on_event(EVENT_TICK, tick)
-        self.on_event(EVENT_TICK + tick.vt_symbol, tick)
+        self.on_event(EVENT_TICK, tick, tick.vt_symbol)
 
     def on_trade(self, trade: TradeData) -> None:
         """
         Trade event push.
-        Trade event of a specific vt_symbol is also pushed.
+        Handlers of trade event of a specific vt_symbol are also called.
         """
-        self.on_event(EVENT_TRADE, trade)
-        self.on_event(EVENT_TRADE + trade.vt_symbol, trade)
+        self.on_event(EVENT_TRADE, trade, trade.vt_symbol)
 
     def on_order(self, order: OrderData) -> None:
         """
         Order event push.
-        Order event of a specific vt_orderid is also pushed.
+        Handlers of order event of a specific vt_orderid are also called.
         """
-        self.on_event(EVENT_ORDER, order)
-        self.on_event(EVENT_ORDER + order.vt_orderid, order)
+        self.on_event(EVENT_ORDER, order, order.vt_orderid)
 
     def on_position(self, position: PositionData) -> None:
         """
         Position event push.
-        Position event of a specific vt_symbol is also pushed.
+        Handlers of position event of a specific vt_symbol are also called.
         """
-        self.on_event(EVENT_POSITION, position)
-        self.on_event(EVENT_POSITION + position.vt_symbol, position)
+        self.on_event(EVENT_POSITION, position, position.vt_symbol)
 
     def on_account(self, account: AccountData) -> None:
         """
         Account event push.
-        Account event of a specific vt_accountid is also pushed.
+        Handlers of account event of a specific vt_accountid are also called.
         """
-        self.on_event(EVENT_ACCOUNT, account)
-        self.on_event(EVENT_ACCOUNT + account.vt_accountid, account)
+        self.on_event(EVENT_ACCOUNT, account, account.vt_accountid)
 
     def on_quote(self, quote: QuoteData) -> None:
         """
         Quote event push.
-        Quote event of a specific vt_symbol is also pushed.
+        Handlers of quote event of a specific vt_symbol are also called.
         """
-        self.on_event(EVENT_QUOTE, quote)
-        self.on_event(EVENT_QUOTE + quote.vt_symbol, quote)
+        self.on_event(EVENT_QUOTE, quote, quote.vt_symbol)
 
     def on_log(self, log: LogData) -> None:
         """
@@ -0,0 +1,247 @@
+"""
+Streaming technical indicators updated in O(1) per bar.
+
+Unlike ArrayManager functions which recalculate talib indicator over
+the whole window every bar, these indicators keep running state and
+update it with each new bar. Recursive indicators (EMA, RSI, ATR, MACD)
+are calculated over all bars since registered, so their values may be
+slightly different from talib results of the limited window, which are
+seeded again at the start of the window each time.
+"""
+
+from math import nan, isnan
+from typing import Tuple
+
+import numpy as np
+
+from .object import BarData
+
+
+class RecursiveAverage:
+    """
+    Exponential average seeded by simple average of the first n samples,
+    alpha is 2 / (n + 1) for EMA and 1 / n for Wilder's smoothing.
+    """
+
+    def __init__(self, n: int, alpha: float) -> None:
+        """"""
+        self.n: int = n
+        self.alpha: float = alpha
+
+        self.count: int = 0
+        self.total: float = 0
+        self.value: float = nan
+
+    def update(self, x: float) -> float:
+        """
+        Update new sample and return the average, nan if not enough samples.
+        """
+        if self.count < self.n:
+            self.count += 1
+            self.total += x
+
+            if self.count == self.n:
+                self.value = self.total / self.n
+        else:
+            self.value += self.alpha * (x - self.value)
+
+        return self.value
+
+
+class Indicator:
+    """
+    Base class of streaming indicator, which keeps history of the latest
+    size of values of each output.
+    """
+
+    outputs: Tuple[str, ...] = ("value",)
+
+    def __init__(self, size: int = 100) -> None:
+        """"""
+        self.size: int = size
+        self.count: int = 0
+
+        # Double size buffer same as ArrayManager
+        self.buffer: np.ndarray = np.full((len(self.outputs), size * 2), nan)
+        self.end: int = size
+
+    def update_bar(self, bar: BarData) -> None:
+        """
+        Update new bar data into indicator.
+        """
+        values: Tuple[float, ...] = self.calculate(bar)
+        self.count += 1
+
+        if self.end == self.buffer.shape[1]:
+            self.buffer[:, :self.size - 1] = self.buffer[:, self.end - self.size + 1:]
+            self.end = self.size - 1
+
+        self.buffer[:, self.end] = values
+        self.end += 1
+
+    def calculate(self, bar: BarData) -> Tuple[float, ...]:
+        """
+        Update state with new bar and return values of all outputs.
+        """
+        raise NotImplementedError
+
+    @property
+    def value(self) -> float:
+        """
+        Get latest value of the first output.
+        """
+        return self.buffer[0, self.end - 1]
+
+    def get_value(self, name: str) -> float:
+        """
+        Get latest value of output.
+        """
+        return self.buffer[self.outputs.index(name), self.end - 1]
+
+    def get_array(self, name: str = "") -> np.ndarray:
+        """
+        Get history of output (the first one if name not passed).
+        """
+        row: int = self.outputs.index(name) if name else 0
+        return self.buffer[row, self.end - self.size:self.end]
+
+
+class SmaIndicator(Indicator):
+    """
+    Simple moving average of close price.
+    """
+
+    def __init__(self, n: int, size: int = 100) -> None:
+        """"""
+        super().__init__(size)
+
+        self.n: int = n
+        self.closes: np.ndarray = np.zeros(n)
+        self.total: float = 0
+
+    def calculate(self, bar: BarData) -> Tuple[float, ...]:
+        """"""
+        index: int = self.count % self.n
+
+        self.total += bar.close_price - self.closes[index]
+        self.closes[index] = bar.close_price
+
+        # Recalculate sum every cycle to avoid accumulating float errors
+        if index == self.n - 1:
+            self.total = self.closes.sum()
+
+        if self.count < self.n - 1:
+            return (nan,)
+        return (self.total / self.n,)
+
+
+class EmaIndicator(Indicator):
+    """
+    Exponential moving average of close price.
+    """
+
+    def __init__(self, n: int, size: int = 100) -> None:
+        """"""
+        super().__init__(size)
+
+        self.average: RecursiveAverage = RecursiveAverage(n, 2 / (n + 1))
+
+    def calculate(self, bar: BarData) -> Tuple[float, ...]:
+        """"""
+        return (self.average.update(bar.close_price),)
+
+
+class RsiIndicator(Indicator):
+    """
+    Relative Strength Index with Wilder's smoothing.
+    """
+
+    def __init__(self, n: int, size: int = 100) -> None:
+        """"""
+        super().__init__(size)
+
+        self.gain: RecursiveAverage = RecursiveAverage(n, 1 / n)
+        self.loss: RecursiveAverage = RecursiveAverage(n, 1 / n)
+        self.last_close: float = nan
+
+    def calculate(self, bar: BarData) -> Tuple[float, ...]:
+        """"""
+        last_close: float = self.last_close
+        self.last_close = bar.close_price
+
+        if isnan(last_close):
+            return (nan,)
+
+        change: float = bar.close_price - last_close
+        gain: float = self.gain.update(max(change, 0))
+        loss: float = self.loss.update(max(-change, 0))
+
+        if isnan(gain):
+            return (nan,)
+
+        total: float = gain + loss
+        if not total:
+            return (0,)
+        return (100 * gain / total,)
+
+
+class AtrIndicator(Indicator):
+    """
+    Average True Range with Wilder's smoothing.
+    """
+
+    def __init__(self, n: int, size: int = 100) -> None:
+        """"""
+        super().__init__(size)
+
+        self.average: RecursiveAverage = RecursiveAverage(n, 1 / n)
+        self.last_close: float = nan
+
+    def calculate(self, bar: BarData) -> Tuple[float, ...]:
+        """"""
+        last_close: float = self.last_close
+        self.last_close = bar.close_price
+
+        if isnan(last_close):
+            return (nan,)
+
+        true_range: float = max(
+            bar.high_price - bar.low_price,
+            abs(bar.high_price - last_close),
+            abs(bar.low_price - last_close)
+        )
+        return (self.average.update(true_range),)
+
+
+class MacdIndicator(Indicator):
+    """
+    MACD of close price, with outputs of macd, signal and hist.
+    """
+
+    outputs: Tuple[str, ...] = ("macd", "signal", "hist")
+
+    def __init__(
+        self,
+        fast_period: int,
+        slow_period: int,
+        signal_period: int,
+        size: int = 100
+    ) -> None:
+        """"""
+        super().__init__(size)
+
+        self.fast: RecursiveAverage = RecursiveAverage(fast_period, 2 / (fast_period + 1))
+        self.slow: RecursiveAverage = RecursiveAverage(slow_period, 2 / (slow_period + 1))
+        self.signal: RecursiveAverage = RecursiveAverage(signal_period, 2 / (signal_period + 1))
+
+    def calculate(self, bar: BarData) -> Tuple[float, ...]:
+        """"""
+        fast: float = self.fast.update(bar.close_price)
+        slow: float = self.slow.update(bar.close_price)
+
+        if isnan(slow):
+            return (nan, nan, nan)
+
+        macd: float = fast - slow
+        signal: float = self.signal.update(macd)
+        return (macd, signal, macd - signal)
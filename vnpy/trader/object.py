@@ -2,15 +2,95 @@
 Basic data structure used for general trading function in the trading platform.
 """
 
-from dataclasses import dataclass, field
-from datetime import datetime
+import sys
+from dataclasses import MISSING, dataclass, field, fields
+from functools import wraps
+from datetime import datetime, tzinfo
 from logging import INFO
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 from .constant import Direction, Exchange, Interval, Offset, Status, Product, OptionType, OrderType
 
 ACTIVE_STATUSES = set([Status.SUBMITTING, Status.NOTTRADED, Status.PARTTRADED])
 
+# Max number of vt_orderid/vt_quoteid cached.
+VT_ID_CACHE_SIZE = 100000
+
+# Interned vt_symbol strings, and the (symbol, exchange) pairs of them.
+vt_symbols: Dict[Tuple[str, Exchange], str] = {}
+symbol_pairs: Dict[str, Tuple[str, Exchange]] = {}
+
+# Caches of last used value for each symbol/id, checked by identity
+# which is much faster than hashing tuple of enum.
+symbol_cache: Dict[str, Tuple[Exchange, str]] = {}
+vt_id_cache: Dict[str, Tuple[str, str]] = {}
+vt_positionids: Dict[Tuple[str, str, Direction], str] = {}
+
+
+def get_vt_symbol(symbol: str, exchange: Exchange) -> str:
+    """
+    Get interned vt_symbol string of symbol and exchange.
+    """
+    cached: Optional[tuple] = symbol_cache.get(symbol, None)
+    if cached and cached[0] is exchange:
+        return cached[1]
+
+    vt_symbol: Optional[str] = vt_symbols.get((symbol, exchange), None)
+    if not vt_symbol:
+        vt_symbol = sys.intern(f"{symbol}.{exchange.value}")
+        vt_symbols[(symbol, exchange)] = vt_symbol
+        symbol_pairs[vt_symbol] = (symbol, exchange)
+
+    symbol_cache[symbol] = (exchange, vt_symbol)
+    return vt_symbol
+
+
+def get_symbol_pair(vt_symbol: str) -> Tuple[str, Exchange]:
+    """
+    Get cached (symbol, exchange) pair of vt_symbol.
+    """
+    pair: Optional[tuple] = symbol_pairs.get(vt_symbol, None)
+    if pair:
+        return pair
+
+    symbol, exchange_str = vt_symbol.rsplit(".", 1)
+    exchange: Exchange = Exchange(exchange_str)
+
+    get_vt_symbol(symbol, exchange)
+    return symbol, exchange
+
+
+def get_vt_id(gateway_name: str, id: str) -> str:
+    """
+    Get interned vt id string (e.g. vt_orderid) of gateway_name and id.
+    """
+    cached: Optional[tuple] = vt_id_cache.get(id, None)
+    if cached and cached[0] is gateway_name:
+        return cached[1]
+
+    if len(vt_id_cache) >= VT_ID_CACHE_SIZE:
+        vt_id_cache.clear()
+
+    vt_id: str = sys.intern(f"{gateway_name}.{id}")
+    vt_id_cache[id] = (gateway_name, vt_id)
+    return vt_id
+
+
+def get_vt_positionid(gateway_name: str, vt_symbol: str, direction: Direction) -> str:
+    """
+    Get interned vt_positionid string.
+    """
+    key: tuple = (gateway_name, vt_symbol, direction)
+
+    vt_positionid: Optional[str] = vt_positionids.get(key, None)
+    if not vt_positionid:
+        vt_positionid = sys.intern(f"{gateway_name}.{vt_symbol}.{direction.value}")
+        vt_positionids[key] = vt_positionid
+
+    return vt_positionid
+
 
 @dataclass
 class BaseData:
@@ -79,7 +159,7 @@ class TickData(BaseData):
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -103,7 +183,54 @@ class BarData(BaseData):
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
+
+
+def create_slotted_class(cls: type, name: str, extra_slots: Sequence[str]) -> type:
+    """
+    Create a copy of dataclass with __slots__ instead of per-instance
+    __dict__, which has the same fields and methods of the original one.
+
+    Attributes set in __post_init__ should be passed as extra_slots.
+    """
+    field_names: list = [f.name for f in fields(cls)]
+
+    namespace: dict = {}
+    for base in reversed(cls.__mro__[:-1]):
+        namespace.update(base.__dict__)
+
+    for key in field_names + ["__dict__", "__weakref__"]:
+        namespace.pop(key, None)
+
+    namespace["__slots__"] = tuple(field_names) + tuple(extra_slots)
+    namespace["__qualname__"] = name
+    namespace["__module__"] = cls.__module__
+
+    # Fields not in __init__ read default from class attribute which
+    # is removed, so they should be assigned before calling __init__.
+    defaults: list = [
+        (f.name, f.default) for f in fields(cls)
+        if not f.init and f.default is not MISSING
+    ]
+
+    if defaults:
+        original_init: Callable = cls.__init__
+
+        @wraps(original_init)
+        def __init__(self, *args, **kwargs) -> None:
+            for key, value in defaults:
+                setattr(self, key, value)
+            original_init(self, *args, **kwargs)
+
+        namespace["__init__"] = __init__
+
+    return type(name, (object,), namespace)
+
+
+# Slotted TickData and BarData with much smaller memory footprint, for
+# holding large amount of data such as replaying or loading history.
+CompactTickData = create_slotted_class(TickData, "CompactTickData", ["vt_symbol"])
+CompactBarData = create_slotted_class(BarData, "CompactBarData", ["vt_symbol"])
 
 
 @dataclass
@@ -129,8 +256,8 @@ class OrderData(BaseData):
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
-        self.vt_orderid: str = f"{self.gateway_name}.{self.orderid}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
+        self.vt_orderid: str = get_vt_id(self.gateway_name, self.orderid)
 
     def is_active(self) -> bool:
         """
@@ -168,8 +295,8 @@ class TradeData(BaseData):
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
-        self.vt_orderid: str = f"{self.gateway_name}.{self.orderid}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
+        self.vt_orderid: str = get_vt_id(self.gateway_name, self.orderid)
         self.vt_tradeid: str = f"{self.gateway_name}.{self.tradeid}"
 
 
@@ -191,8 +318,8 @@ class PositionData(BaseData):
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
-        self.vt_positionid: str = f"{self.gateway_name}.{self.vt_symbol}.{self.direction.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
+        self.vt_positionid: str = get_vt_positionid(self.gateway_name, self.vt_symbol, self.direction)
 
 
 @dataclass
@@ -210,7 +337,7 @@ class AccountData(BaseData):
     def __post_init__(self) -> None:
         """"""
         self.available: float = self.balance - self.frozen
-        self.vt_accountid: str = f"{self.gateway_name}.{self.accountid}"
+        self.vt_accountid: str = get_vt_id(self.gateway_name, self.accountid)
 
 
 @dataclass
@@ -256,7 +383,7 @@ class ContractData(BaseData):
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -282,8 +409,8 @@ class QuoteData(BaseData):
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
-        self.vt_quoteid: str = f"{self.gateway_name}.{self.quoteid}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
+        self.vt_quoteid: str = get_vt_id(self.gateway_name, self.quoteid)
 
     def is_active(self) -> bool:
         """
@@ -312,7 +439,7 @@ class SubscribeRequest:
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -332,7 +459,7 @@ class OrderRequest:
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
     def create_order_data(self, orderid: str, gateway_name: str) -> OrderData:
         """
@@ -365,7 +492,7 @@ class CancelRequest:
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -382,7 +509,7 @@ class HistoryRequest:
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -403,7 +530,7 @@ class QuoteRequest:
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
     def create_quote_data(self, quoteid: str, gateway_name: str) -> QuoteData:
         """
@@ -423,3 +550,157 @@ class QuoteRequest:
             gateway_name=gateway_name,
         )
         return quote
+
+
+class DataBatch:
+    """
+    Columnar container of data of one contract, which stores each
+    field in a column of NumPy structured array instead of creating
+    a Python object per row.
+
+    Fields same for all rows (e.g. symbol) are kept as attributes.
+    Datetimes are stored as datetime64 without timezone, which is
+    restored when converted back to data objects, by tzinfo for the
+    datetime column and by tzinfos for other time columns (e.g.
+    localtime of tick), which are kept naive if not found.
+    """
+
+    data_class: type = None
+    constant_names: Tuple[str, ...] = ()
+    time_names: Tuple[str, ...] = ()
+    dtype: np.dtype = None
+
+    def __init__(
+        self,
+        array: np.ndarray,
+        tzinfo: Optional[tzinfo] = None,
+        tzinfos: Optional[Dict[str, tzinfo]] = None,
+        **constants
+    ) -> None:
+        """"""
+        self.array: np.ndarray = array
+        self.tzinfo: Optional[tzinfo] = tzinfo
+        self.tzinfos: Dict[str, tzinfo] = dict(tzinfos) if tzinfos else {}
+        self.constants: dict = constants
+
+        for name in self.constant_names:
+            setattr(self, name, constants.get(name, None))
+
+        self.vt_symbol: str = ""
+        if self.symbol and self.exchange:
+            self.vt_symbol = get_vt_symbol(self.symbol, self.exchange)
+
+    @classmethod
+    def from_list(cls, data: list) -> "DataBatch":
+        """
+        Create batch from list of data objects.
+        """
+        array: np.ndarray = np.empty(len(data), dtype=cls.dtype)
+        if not data:
+            return cls(array)
+
+        first: object = data[0]
+        constants: dict = {name: getattr(first, name) for name in cls.constant_names}
+        tzinfos: Dict[str, tzinfo] = {}
+
+        for name in cls.dtype.names:
+            if name in cls.time_names:
+                column: list = [getattr(d, name) for d in data]
+                array[name] = [_to_datetime64(dt) for dt in column]
+
+                dt: Optional[datetime] = next((dt for dt in column if dt), None)
+                if name != "datetime" and dt and dt.tzinfo:
+                    tzinfos[name] = dt.tzinfo
+            else:
+                array[name] = [getattr(d, name) for d in data]
+
+        return cls(array, first.datetime.tzinfo, tzinfos, **constants)
+
+    def to_list(self, data_class: type = None) -> list:
+        """
+        Convert batch to list of data objects, e.g. CompactBarData can
+        be passed as data_class for smaller memory footprint.
+        """
+        if not data_class:
+            data_class = self.data_class
+
+        names: Tuple[str, ...] = self.dtype.names
+        columns: list = []
+
+        for name in names:
+            column: list = self.array[name].tolist()
+
+            if name in self.time_names:
+                if name == "datetime":
+                    tz: Optional[tzinfo] = self.tzinfo
+                else:
+                    tz = self.tzinfos.get(name, None)
+
+                if tz:
+                    column = [dt.replace(tzinfo=tz) if dt else None for dt in column]
+
+            columns.append(column)
+
+        return [
+            data_class(**self.constants, **dict(zip(names, values)))
+            for values in zip(*columns)
+        ]
+
+    def __len__(self) -> int:
+        """"""
+        return len(self.array)
+
+    def __getitem__(self, key: Union[int, slice, str]) -> Union[np.void, np.ndarray, "DataBatch"]:
+        """
+        Column name returns column array, int index returns row record,
+        slice returns a batch of the rows. No data is copied.
+        """
+        if isinstance(key, slice):
+            return self.__class__(self.array[key], self.tzinfo, self.tzinfos, **self.constants)
+        return self.array[key]
+
+
+def _to_datetime64(dt: Optional[datetime]) -> np.datetime64:
+    """
+    Convert datetime to datetime64 without timezone.
+    """
+    if dt is None:
+        return np.datetime64("NaT")
+    return np.datetime64(dt.replace(tzinfo=None), "us")
+
+
+def _create_dtype(data_class: type, time_names: Sequence[str]) -> np.dtype:
+    """
+    Create dtype of datetime and float fields of data class.
+    """
+    columns: List[tuple] = []
+
+    for f in fields(data_class):
+        if f.name in time_names:
+            columns.append((f.name, "datetime64[us]"))
+        elif f.type is float:
+            columns.append((f.name, "f8"))
+
+    return np.dtype(columns)
+
+
+class BarBatch(DataBatch):
+    """
+    Columnar container of bar data of one contract and interval.
+    """
+
+    data_class: type = BarData
+    constant_names: Tuple[str, ...] = ("symbol", "exchange", "interval", "gateway_name")
+    time_names: Tuple[str, ...] = ("datetime",)
+    dtype: np.dtype = _create_dtype(BarData, time_names)
+
+
+class TickBatch(DataBatch):
+    """
+    Columnar container of tick data of one contract.
+    """
+
+    data_class: type = TickData
+    constant_names: Tuple[str, ...] = ("symbol", "exchange", "name", "gateway_name")
+    time_names: Tuple[str, ...] = ("datetime", "localtime")
+    dtype: np.dtype = _create_dtype(TickData, time_names)
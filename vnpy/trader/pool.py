@@ -0,0 +1,120 @@
+"""
+Pooled tick data objects for reducing allocation in gateways.
+
+Normally a new TickData is created for every market data update, which
+are all immutable after being passed to on_tick. In pooled mode, ticks
+of each symbol are recycled from a ring of preallocated objects instead,
+and every update starts from the data of the latest tick, so the gateway
+only needs to modify the fields changed in the update.
+
+A pooled tick is owned by consumers until the pool recycles it, after
+size more updates of the same symbol. Each acquire stamps the tick with
+a new version, so consumer can check if a retained tick is still the
+data it has seen, or use retain_tick to keep its own copy.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List
+
+from .constant import Exchange
+from .object import TickData, get_vt_symbol
+
+
+@dataclass
+class PooledTickData(TickData):
+    """
+    Tick data recycled by TickPool, version is changed when recycled.
+    """
+
+    version: int = field(default=0, init=False, compare=False)
+
+
+class TickPool:
+    """
+    Ring of recycled tick objects for each symbol.
+
+    Not thread-safe, ticks of one symbol should be acquired from one thread.
+    """
+
+    def __init__(self, gateway_name: str, size: int = 8) -> None:
+        """
+        Size is the number of tick objects of each symbol, should be
+        larger than the number of updates a consumer may lag behind.
+        """
+        if size < 2:
+            raise ValueError("Size of tick pool should be at least 2")
+
+        self.gateway_name: str = gateway_name
+        self.size: int = size
+        self.version: int = 0
+
+        self.slots: Dict[str, List[PooledTickData]] = {}
+        self.indexes: Dict[str, int] = {}
+        self.latest: Dict[str, PooledTickData] = {}
+
+    def acquire(self, symbol: str, exchange: Exchange, datetime: datetime) -> PooledTickData:
+        """
+        Get next tick object of symbol, with data copied from the latest one.
+        """
+        vt_symbol: str = get_vt_symbol(symbol, exchange)
+
+        slots: List[PooledTickData] = self.slots.get(vt_symbol, None)
+        if not slots:
+            slots = [
+                PooledTickData(
+                    symbol=symbol,
+                    exchange=exchange,
+                    datetime=datetime,
+                    gateway_name=self.gateway_name
+                )
+                for _ in range(self.size)
+            ]
+            self.slots[vt_symbol] = slots
+
+        index: int = self.indexes.get(vt_symbol, 0)
+        self.indexes[vt_symbol] = (index + 1) % self.size
+
+        tick: PooledTickData = slots[index]
+
+        latest: PooledTickData = self.latest.get(vt_symbol, None)
+        if latest:
+            tick.__dict__.update(latest.__dict__)
+
+        self.version += 1
+        tick.version = self.version
+        tick.datetime = datetime
+
+        self.latest[vt_symbol] = tick
+        return tick
+
+    def clear(self) -> None:
+        """
+        Drop all tick objects, e.g. when gateway reconnected.
+        """
+        self.slots.clear()
+        self.indexes.clear()
+        self.latest.clear()
+
+
+def copy_tick(tick: TickData) -> TickData:
+    """
+    Create a plain TickData with the same data as tick.
+    """
+    new_tick: TickData = TickData.__new__(TickData)
+    new_tick.__dict__.update(tick.__dict__)
+    new_tick.__dict__.pop("version", None)
+
+    if tick.extra is not None:
+        new_tick.extra = dict(tick.extra)
+
+    return new_tick
+
+
+def retain_tick(tick: TickData) -> TickData:
+    """
+    Get a tick which is safe to be kept, copy is only created for pooled tick.
+    """
+    if type(tick) is PooledTickData:
+        return copy_tick(tick)
+    return tick
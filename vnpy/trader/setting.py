@@ -25,6 +25,9 @@ SETTINGS: Dict[str, Any] = {
     "email.sender": "",
     "email.receiver": "",
 
+    "bar.flush": False,
+    "bar.flush_delay": 0.5,
+
     "datafeed.name": "",
     "datafeed.username": "",
     "datafeed.password": "",
@@ -277,7 +277,14 @@ class BaseMonitor(QtWidgets.QTableWidget):
         """
         if self.event_type:
             self.signal.connect(self.process_event)
-            self.event_engine.register(self.event_type, self.signal.emit)
+            self.event_engine.register(self.event_type, self.emit_event)
+
+    def emit_event(self, event: Event) -> None:
+        """
+        Emit event to be processed in GUI thread, registered as a method
+        of the monitor so that it can be told apart in event metrics.
+        """
+        self.signal.emit(event)
 
     def process_event(self, event: Event) -> None:
         """
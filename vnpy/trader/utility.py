@@ -7,14 +7,20 @@ import logging
 import sys
 from datetime import datetime, time
 from pathlib import Path
-from typing import Callable, Dict, Tuple, Union, Optional
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union, Optional
 from decimal import Decimal
+from functools import wraps
+from inspect import signature
 from math import floor, ceil
+from operator import attrgetter
 
 import numpy as np
 import talib
+from numpy.lib.stride_tricks import sliding_window_view
 
-from .object import BarData, TickData
+from .object import BarData, TickData, TickBatch, get_symbol_pair, get_vt_symbol
+from .pool import retain_tick
+from .indicator import Indicator
 from .constant import Exchange, Interval
 from .locale import _
 
@@ -31,15 +37,14 @@ def extract_vt_symbol(vt_symbol: str) -> Tuple[str, Exchange]:
     """
     :return: (symbol, exchange)
     """
-    symbol, exchange_str = vt_symbol.rsplit(".", 1)
-    return symbol, Exchange(exchange_str)
+    return get_symbol_pair(vt_symbol)
 
 
 def generate_vt_symbol(symbol: str, exchange: Exchange) -> str:
     """
     return vt_symbol
     """
-    return f"{symbol}.{exchange.value}"
+    return get_vt_symbol(symbol, exchange)
 
 
 def _get_trader_dir(temp_name: str) -> Tuple[Path, Path]:
@@ -170,6 +175,16 @@ def get_digits(value: float) -> int:
         return 0
 
 
+def _shift(column: np.ndarray, first: float) -> np.ndarray:
+    """
+    Shift column by one row, with first row filled by value passed.
+    """
+    shifted: np.ndarray = np.empty_like(column)
+    shifted[1:] = column[:-1]
+    shifted[0] = first
+    return shifted
+
+
 class BarGenerator:
     """
     For:
@@ -264,7 +279,100 @@ class BarGenerator:
             turnover_change: float = tick.turnover - self.last_tick.turnover
             self.bar.turnover += max(turnover_change, 0)
 
-        self.last_tick = tick
+        # Pooled tick may be recycled before next update
+        self.last_tick = retain_tick(tick)
+
+    def update_tick_batch(self, batch: TickBatch) -> None:
+        """
+        Update ticks in columnar batch into generator, which is the same
+        as calling update_tick with each tick but vectorized by NumPy.
+        """
+        array: np.ndarray = batch.array[batch.array["last_price"] != 0]
+        if not len(array):
+            return
+
+        last_tick: Optional[TickData] = self.last_tick
+        dt: np.ndarray = array["datetime"]
+        price: np.ndarray = array["last_price"]
+
+        # Minute of day, since only hour and minute are compared for new bar
+        minutes: np.ndarray = dt.astype("datetime64[m]").astype(np.int64) % 1440
+
+        new_minutes: np.ndarray = np.empty(len(array), dtype=bool)
+        new_minutes[1:] = minutes[1:] != minutes[:-1]
+        new_minutes[0] = (
+            not self.bar
+            or self.bar.datetime.hour * 60 + self.bar.datetime.minute != minutes[0]
+        )
+
+        starts: np.ndarray = np.flatnonzero(new_minutes)
+        if not new_minutes[0]:
+            starts = np.concatenate([[0], starts])
+        ends: np.ndarray = np.concatenate([starts[1:], [len(array)]]) - 1
+
+        # High/low price of tick only counts if changed within the bar
+        high: np.ndarray = array["high_price"]
+        high_changed: np.ndarray = ~new_minutes & (high > _shift(high, last_tick.high_price if last_tick else np.nan))
+        bar_high: np.ndarray = np.maximum.reduceat(
+            np.where(high_changed, np.maximum(price, high), price), starts
+        )
+
+        low: np.ndarray = array["low_price"]
+        low_changed: np.ndarray = ~new_minutes & (low < _shift(low, last_tick.low_price if last_tick else np.nan))
+        bar_low: np.ndarray = np.minimum.reduceat(
+            np.where(low_changed, np.minimum(price, low), price), starts
+        )
+
+        changes: Dict[str, np.ndarray] = {}
+        for name in ["volume", "turnover"]:
+            first: float = getattr(last_tick, name) if last_tick else np.nan
+            change: np.ndarray = np.maximum(array[name] - _shift(array[name], first), 0)
+            if not last_tick:
+                change[0] = 0
+            changes[name] = np.add.reduceat(change, starts)
+
+        bar_datetimes: list = dt[ends].tolist()
+        bar_opens: list = price[starts].tolist()
+        bar_highs: list = bar_high.tolist()
+        bar_lows: list = bar_low.tolist()
+        bar_closes: list = price[ends].tolist()
+        bar_volumes: list = changes["volume"].tolist()
+        bar_turnovers: list = changes["turnover"].tolist()
+        bar_open_interests: list = array["open_interest"][ends].tolist()
+
+        for i in range(len(starts)):
+            if i or new_minutes[0]:
+                if self.bar:
+                    self.bar.datetime = self.bar.datetime.replace(
+                        second=0, microsecond=0
+                    )
+                    self.on_bar(self.bar)
+
+                self.bar = BarData(
+                    symbol=batch.symbol,
+                    exchange=batch.exchange,
+                    interval=Interval.MINUTE,
+                    datetime=bar_datetimes[i].replace(tzinfo=batch.tzinfo),
+                    gateway_name=batch.gateway_name,
+                    open_price=bar_opens[i],
+                    high_price=bar_highs[i],
+                    low_price=bar_lows[i],
+                    close_price=bar_closes[i],
+                    volume=bar_volumes[i],
+                    turnover=bar_turnovers[i],
+                    open_interest=bar_open_interests[i]
+                )
+            else:
+                self.bar.high_price = max(self.bar.high_price, bar_highs[i])
+                self.bar.low_price = min(self.bar.low_price, bar_lows[i])
+                self.bar.close_price = bar_closes[i]
+                self.bar.volume += bar_volumes[i]
+                self.bar.turnover += bar_turnovers[i]
+                self.bar.open_interest = bar_open_interests[i]
+                self.bar.datetime = bar_datetimes[i].replace(tzinfo=batch.tzinfo)
+
+        index: int = np.flatnonzero(batch.array["last_price"] != 0)[-1]
+        self.last_tick = batch[index:index + 1].to_list()[0]
 
     def update_bar(self, bar: BarData) -> None:
         """
@@ -484,26 +592,455 @@ class BarGenerator:
         return bar
 
 
+class TradingSession:
+    """
+    Trading periods of a trading day, with lookup tables of each minute
+    of day, e.g. for Chinese futures with night session:
+
+        TradingSession([
+            (time(21, 0), time(2, 30)),
+            (time(9, 0), time(10, 15)),
+            (time(10, 30), time(11, 30)),
+            (time(13, 30), time(15, 0)),
+        ])
+
+    Periods should be passed in order of the trading day, and the end of
+    a period can be earlier than the start if it crosses midnight.
+    """
+
+    def __init__(self, periods: List[Tuple[time, time]]) -> None:
+        """"""
+        self.periods: List[Tuple[time, time]] = periods
+
+        # Index of each minute of day in the trading day, -1 if not trading
+        self.indexes: List[int] = [-1] * 1440
+        self.minutes: int = 0
+
+        for start, end in periods:
+            start_minute: int = start.hour * 60 + start.minute
+            end_minute: int = end.hour * 60 + end.minute
+
+            count: int = (end_minute - start_minute) % 1440 or 1440
+            for i in range(count):
+                minute: int = (start_minute + i) % 1440
+
+                if self.indexes[minute] >= 0:
+                    raise ValueError(_("交易时段存在重叠：{}").format(time(minute // 60, minute % 60)))
+
+                self.indexes[minute] = self.minutes
+                self.minutes += 1
+
+    def get_index(self, dt: datetime) -> int:
+        """
+        Get index of the minute in the trading day, -1 if not trading.
+        """
+        return self.indexes[dt.hour * 60 + dt.minute]
+
+
+class SessionBarGenerator(BarGenerator):
+    """
+    Generator of x minute bars aligned to trading session.
+
+    Window can be any number of minutes (e.g. 7, 45, 90), which is counted
+    from the start of the trading day and across breaks, and the last window
+    bar of the day is closed at the end of the session. A window equal to
+    session.minutes generates daily bar of the trading day.
+
+    Bars outside the session are merged into the window bar in progress.
+    Window closed at the end of a period is held until bar of the minute
+    just after the period ends (e.g. closing bar of CTP) is merged into it,
+    or it is pushed before any other bar. If there is no window, bar of the
+    minute just before a period starts (e.g. opening auction) is merged
+    into the next window, while other bars are dropped.
+    """
+
+    def __init__(
+        self,
+        on_bar: Callable,
+        window: int,
+        on_window_bar: Callable,
+        session: TradingSession
+    ) -> None:
+        """"""
+        super().__init__(on_bar, window, on_window_bar, Interval.MINUTE)
+
+        self.session: TradingSession = session
+
+        # Lookup tables of each minute of day
+        self.buckets: List[int] = []
+        self.closes: List[bool] = []
+        self.opens: List[bool] = []
+        self.ends: List[bool] = []
+
+        for minute, index in enumerate(session.indexes):
+            if index < 0:
+                self.buckets.append(-1)
+                self.closes.append(False)
+                self.opens.append(session.indexes[(minute + 1) % 1440] >= 0)
+                self.ends.append(session.indexes[minute - 1] >= 0)
+            else:
+                self.buckets.append(index // window)
+                self.closes.append(
+                    not (index + 1) % window or index == session.minutes - 1
+                )
+                self.opens.append(False)
+                self.ends.append(False)
+
+        self.bucket: int = -1
+        self.last_index: int = -1
+        self.held: bool = False
+
+    def update_bar(self, bar: BarData) -> None:
+        """
+        Update 1 minute bar into generator.
+        """
+        minute: int = bar.datetime.hour * 60 + bar.datetime.minute
+        index: int = self.session.indexes[minute]
+
+        # Window held at period end only waits for the closing bar
+        closing: bool = False
+        if self.held:
+            if self.ends[minute]:
+                closing = True
+            else:
+                self.push_window_bar()
+
+        # Push window bar whose last bars are missing
+        if (
+            self.window_bar
+            and index >= 0
+            and self.bucket >= 0
+            and (self.buckets[minute] != self.bucket or index <= self.last_index)
+        ):
+            self.push_window_bar()
+
+        # Drop bar after close which must not open the next window
+        if index < 0 and not self.window_bar and not self.opens[minute]:
+            return
+
+        if not self.window_bar:
+            self.window_bar = BarData(
+                symbol=bar.symbol,
+                exchange=bar.exchange,
+                datetime=bar.datetime.replace(second=0, microsecond=0),
+                gateway_name=bar.gateway_name,
+                open_price=bar.open_price,
+                high_price=bar.high_price,
+                low_price=bar.low_price
+            )
+        else:
+            self.window_bar.high_price = max(
+                self.window_bar.high_price,
+                bar.high_price
+            )
+            self.window_bar.low_price = min(
+                self.window_bar.low_price,
+                bar.low_price
+            )
+
+        self.window_bar.close_price = bar.close_price
+        self.window_bar.volume += bar.volume
+        self.window_bar.turnover += bar.turnover
+        self.window_bar.open_interest = bar.open_interest
+
+        if closing:
+            self.push_window_bar()
+            return
+
+        if index < 0:
+            return
+
+        # Window opened by bar before period start is stamped with first bar in session
+        if self.bucket < 0:
+            self.window_bar.datetime = bar.datetime.replace(second=0, microsecond=0)
+
+        self.bucket = self.buckets[minute]
+        self.last_index = index
+
+        if self.closes[minute]:
+            if self.ends[(minute + 1) % 1440]:
+                self.held = True
+            else:
+                self.push_window_bar()
+
+    def push_window_bar(self) -> None:
+        """"""
+        self.on_window_bar(self.window_bar)
+
+        self.window_bar = None
+        self.bucket = -1
+        self.held = False
+
+
+class InformationBarGenerator:
+    """
+    Base class of generators which build bars from ticks by trading
+    activity instead of time, so that fewer bars are generated in quiet
+    market and more during bursts.
+
+    A bar is finished when check_bar returns True after the tick is
+    updated, the tick which crosses the threshold is included in the bar.
+    """
+
+    def __init__(self, on_bar: Callable, threshold: float) -> None:
+        """"""
+        self.on_bar: Callable = on_bar
+        self.threshold: float = threshold
+
+        self.bar: BarData = None
+        self.tick_count: int = 0
+        self.last_tick: TickData = None
+
+    def update_tick(self, tick: TickData) -> None:
+        """
+        Update new tick data into generator.
+        """
+        # Filter tick data with 0 last price
+        if not tick.last_price:
+            return
+
+        if not self.bar:
+            self.bar = BarData(
+                symbol=tick.symbol,
+                exchange=tick.exchange,
+                datetime=tick.datetime,
+                gateway_name=tick.gateway_name,
+                open_price=tick.last_price,
+                high_price=tick.last_price,
+                low_price=tick.last_price,
+                close_price=tick.last_price,
+                open_interest=tick.open_interest
+            )
+            self.tick_count = 0
+        else:
+            self.bar.high_price = max(self.bar.high_price, tick.last_price)
+            if tick.high_price > self.last_tick.high_price:
+                self.bar.high_price = max(self.bar.high_price, tick.high_price)
+
+            self.bar.low_price = min(self.bar.low_price, tick.last_price)
+            if tick.low_price < self.last_tick.low_price:
+                self.bar.low_price = min(self.bar.low_price, tick.low_price)
+
+            self.bar.close_price = tick.last_price
+            self.bar.open_interest = tick.open_interest
+
+        if self.last_tick:
+            volume_change: float = tick.volume - self.last_tick.volume
+            self.bar.volume += max(volume_change, 0)
+
+            turnover_change: float = tick.turnover - self.last_tick.turnover
+            self.bar.turnover += max(turnover_change, 0)
+
+        self.tick_count += 1
+
+        # Pooled tick may be recycled before next update
+        self.last_tick = retain_tick(tick)
+
+        if self.check_bar(self.bar):
+            self.on_bar(self.bar)
+            self.bar = None
+
+    def check_bar(self, bar: BarData) -> bool:
+        """
+        Check if the bar is finished.
+        """
+        raise NotImplementedError
+
+
+class VolumeBarGenerator(InformationBarGenerator):
+    """
+    Generate bar every time traded volume reaches threshold.
+    """
+
+    def check_bar(self, bar: BarData) -> bool:
+        """"""
+        return bar.volume >= self.threshold
+
+
+class TurnoverBarGenerator(InformationBarGenerator):
+    """
+    Generate bar every time traded turnover reaches threshold.
+    """
+
+    def check_bar(self, bar: BarData) -> bool:
+        """"""
+        return bar.turnover >= self.threshold
+
+
+class TickCountBarGenerator(InformationBarGenerator):
+    """
+    Generate bar every threshold number of ticks.
+    """
+
+    def check_bar(self, bar: BarData) -> bool:
+        """"""
+        return self.tick_count >= self.threshold
+
+
+class RangeBarGenerator(InformationBarGenerator):
+    """
+    Generate bar every time high low range of the bar reaches threshold.
+    """
+
+    def check_bar(self, bar: BarData) -> bool:
+        """"""
+        return bar.high_price - bar.low_price >= self.threshold
+
+
+class RenkoBarGenerator(InformationBarGenerator):
+    """
+    Generate bar every time price moves threshold (brick size) from close
+    price of the previous bar. Close price of the bar is the last price,
+    which may be beyond the brick if price gaps.
+    """
+
+    def __init__(self, on_bar: Callable, threshold: float) -> None:
+        """"""
+        super().__init__(on_bar, threshold)
+
+        self.last_close: float = 0
+
+    def check_bar(self, bar: BarData) -> bool:
+        """"""
+        # Use open price as reference for the first bar
+        if not self.last_close:
+            self.last_close = bar.open_price
+
+        if abs(bar.close_price - self.last_close) < self.threshold:
+            return False
+
+        self.last_close = bar.close_price
+        return True
+
+
+# Fields which can be tracked by ArrayManager, and attributes of bar data
+BAR_ATTRIBUTES: Dict[str, str] = {
+    "open": "open_price",
+    "high": "high_price",
+    "low": "low_price",
+    "close": "close_price",
+    "volume": "volume",
+    "turnover": "turnover",
+    "open_interest": "open_interest"
+}
+ARRAY_FIELDS: Tuple[str, ...] = tuple(BAR_ATTRIBUTES)
+
+
+def cache_indicator(func: Callable) -> Callable:
+    """
+    Cache full array result of indicator function of ArrayManager until
+    next bar is updated, so calls with the same parameters (including the
+    ones inside other indicators) only calculate once per bar.
+
+    Callers get a copy of the cached array when array is True, so it can
+    still be modified in place. Cache is only cleared by update_bar, so it
+    is not refreshed if data arrays (e.g. close_array) are written directly.
+    """
+    names: list = list(signature(func).parameters)
+    array_index: int = names.index("array") - 1
+
+    @wraps(func)
+    def wrapper(self: "ArrayManager", *args, **kwargs) -> Any:
+        if len(args) > array_index:
+            array: bool = args[array_index]
+            args = args[:array_index]
+        else:
+            array = kwargs.pop("array", False)
+
+        key: tuple = (func.__name__, args, tuple(kwargs.items()))
+
+        result: Any = self.cache.get(key, None)
+        if result is None:
+            self.cache_misses += 1
+            result = func(self, *args, array=True, **kwargs)
+            self.cache[key] = result
+        else:
+            self.cache_hits += 1
+
+        if array:
+            if isinstance(result, tuple):
+                return tuple([r.copy() for r in result])
+            return result.copy()
+        if isinstance(result, tuple):
+            return tuple([r[-1] for r in result])
+        return result[-1]
+
+    return wrapper
+
+
 class ArrayManager(object):
     """
     For:
     1. time series container of bar data
     2. calculating technical indicator value
+
+    Data is stored in a buffer of double size, new bar is appended after
+    the latest one, and the latest size of data are exposed as contiguous
+    views. Data is only moved to the head when the buffer is full, so
+    update is O(1) amortized instead of shifting all arrays every bar.
+
+    To save memory, only part of fields can be tracked, and data can be
+    stored as float32, which is converted to float64 for talib when used.
     """
 
-    def __init__(self, size: int = 100) -> None:
+    def __init__(
+        self,
+        size: int = 100,
+        fields: Sequence[str] = ARRAY_FIELDS,
+        dtype: type = np.float64
+    ) -> None:
         """Constructor"""
         self.count: int = 0
         self.size: int = size
         self.inited: bool = False
 
-        self.open_array: np.ndarray = np.zeros(size)
-        self.high_array: np.ndarray = np.zeros(size)
-        self.low_array: np.ndarray = np.zeros(size)
-        self.close_array: np.ndarray = np.zeros(size)
-        self.volume_array: np.ndarray = np.zeros(size)
-        self.turnover_array: np.ndarray = np.zeros(size)
-        self.open_interest_array: np.ndarray = np.zeros(size)
+        if not fields:
+            raise ValueError(_("不支持的数据字段：{}").format(fields))
+
+        for name in fields:
+            if name not in ARRAY_FIELDS:
+                raise ValueError(_("不支持的数据字段：{}").format(name))
+
+        self.fields: Tuple[str, ...] = tuple(fields)
+
+        getter: Callable = attrgetter(*[BAR_ATTRIBUTES[name] for name in self.fields])
+        if len(self.fields) == 1:
+            # Getter of one attribute returns value instead of tuple
+            self.get_values: Callable = lambda bar: (getter(bar),)
+        else:
+            self.get_values = getter
+
+        # Rows of fields tracked
+        self.buffer: np.ndarray = np.zeros((len(self.fields), size * 2), dtype=dtype)
+        self.end: int = size
+
+        # Views of fields not tracked are always None
+        self.open_array: Optional[np.ndarray] = None
+        self.high_array: Optional[np.ndarray] = None
+        self.low_array: Optional[np.ndarray] = None
+        self.close_array: Optional[np.ndarray] = None
+        self.volume_array: Optional[np.ndarray] = None
+        self.turnover_array: Optional[np.ndarray] = None
+        self.open_interest_array: Optional[np.ndarray] = None
+
+        self.update_views()
+
+        # Streaming indicators updated with each bar
+        self.indicators: Dict[str, Indicator] = {}
+
+        # Results of indicator functions of the latest bar
+        self.cache: Dict[tuple, Any] = {}
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+
+    def update_views(self) -> None:
+        """
+        Update views of the latest size of data in buffer.
+        """
+        views: np.ndarray = self.buffer[:, self.end - self.size:self.end]
+
+        for name, view in zip(self.fields, views):
+            setattr(self, name + "_array", view)
 
     def update_bar(self, bar: BarData) -> None:
         """
@@ -513,71 +1050,104 @@ class ArrayManager(object):
         if not self.inited and self.count >= self.size:
             self.inited = True
 
-        self.open_array[:-1] = self.open_array[1:]
-        self.high_array[:-1] = self.high_array[1:]
-        self.low_array[:-1] = self.low_array[1:]
-        self.close_array[:-1] = self.close_array[1:]
-        self.volume_array[:-1] = self.volume_array[1:]
-        self.turnover_array[:-1] = self.turnover_array[1:]
-        self.open_interest_array[:-1] = self.open_interest_array[1:]
-
-        self.open_array[-1] = bar.open_price
-        self.high_array[-1] = bar.high_price
-        self.low_array[-1] = bar.low_price
-        self.close_array[-1] = bar.close_price
-        self.volume_array[-1] = bar.volume
-        self.turnover_array[-1] = bar.turnover
-        self.open_interest_array[-1] = bar.open_interest
+        # Move latest data to the head when buffer is full
+        if self.end == self.buffer.shape[1]:
+            self.buffer[:, :self.size - 1] = self.buffer[:, self.end - self.size + 1:]
+            self.end = self.size - 1
+
+        self.buffer[:, self.end] = self.get_values(bar)
+        self.end += 1
+
+        self.update_views()
+        self.cache.clear()
+
+        for indicator in self.indicators.values():
+            indicator.update_bar(bar)
+
+    def get_array(self, name: str) -> np.ndarray:
+        """
+        Get time series of field as float64 for calculation, data stored
+        in other dtype is converted once per bar.
+        """
+        array: Optional[np.ndarray] = getattr(self, name + "_array")
+
+        if array is None:
+            raise ValueError(_("数据字段未被记录：{}").format(name))
+
+        if array.dtype == np.float64:
+            return array
+
+        key: tuple = ("get_array", name)
+        result: Optional[np.ndarray] = self.cache.get(key, None)
+        if result is None:
+            result = array.astype(np.float64)
+            self.cache[key] = result
+        return result
+
+    def add_indicator(self, name: str, indicator: Indicator) -> Indicator:
+        """
+        Add streaming indicator which is updated with each new bar,
+        should be added before any bar is updated.
+        """
+        self.indicators[name] = indicator
+        return indicator
+
+    def get_indicator(self, name: str) -> Optional[Indicator]:
+        """
+        Get streaming indicator added by name.
+        """
+        return self.indicators.get(name, None)
 
     @property
     def open(self) -> np.ndarray:
         """
         Get open price time series.
         """
-        return self.open_array
+        return self.get_array("open")
 
     @property
     def high(self) -> np.ndarray:
         """
         Get high price time series.
         """
-        return self.high_array
+        return self.get_array("high")
 
     @property
     def low(self) -> np.ndarray:
         """
         Get low price time series.
         """
-        return self.low_array
+        return self.get_array("low")
 
     @property
     def close(self) -> np.ndarray:
         """
         Get close price time series.
         """
-        return self.close_array
+        return self.get_array("close")
 
     @property
     def volume(self) -> np.ndarray:
         """
         Get trading volume time series.
         """
-        return self.volume_array
+        return self.get_array("volume")
 
     @property
     def turnover(self) -> np.ndarray:
         """
         Get trading turnover time series.
         """
-        return self.turnover_array
+        return self.get_array("turnover")
 
     @property
     def open_interest(self) -> np.ndarray:
         """
         Get trading volume time series.
         """
-        return self.open_interest_array
+        return self.get_array("open_interest")
 
+    @cache_indicator
     def sma(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Simple moving average.
@@ -587,6 +1157,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def ema(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Exponential moving average.
@@ -596,6 +1167,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def kama(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         KAMA.
@@ -605,6 +1177,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def wma(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         WMA.
@@ -614,6 +1187,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def apo(
         self,
         fast_period: int,
@@ -629,6 +1203,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def cmo(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         CMO.
@@ -638,6 +1213,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def mom(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         MOM.
@@ -647,6 +1223,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def ppo(
         self,
         fast_period: int,
@@ -662,6 +1239,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def roc(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ROC.
@@ -671,6 +1249,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def rocr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ROCR.
@@ -680,6 +1259,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def rocp(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ROCP.
@@ -689,6 +1269,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def rocr_100(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ROCR100.
@@ -698,6 +1279,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def trix(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         TRIX.
@@ -707,6 +1289,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def std(self, n: int, nbdev: int = 1, array: bool = False) -> Union[float, np.ndarray]:
         """
         Standard deviation.
@@ -716,6 +1299,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def obv(self, array: bool = False) -> Union[float, np.ndarray]:
         """
         OBV.
@@ -725,6 +1309,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def cci(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Commodity Channel Index (CCI).
@@ -734,6 +1319,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def atr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Average True Range (ATR).
@@ -743,6 +1329,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def natr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         NATR.
@@ -752,6 +1339,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def rsi(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Relative Strenght Index (RSI).
@@ -761,6 +1349,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def macd(
         self,
         fast_period: int,
@@ -781,6 +1370,7 @@ class ArrayManager(object):
             return macd, signal, hist
         return macd[-1], signal[-1], hist[-1]
 
+    @cache_indicator
     def adx(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ADX.
@@ -790,6 +1380,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def adxr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ADXR.
@@ -799,6 +1390,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def dx(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         DX.
@@ -808,6 +1400,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def minus_di(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         MINUS_DI.
@@ -817,6 +1410,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def plus_di(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         PLUS_DI.
@@ -826,6 +1420,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def willr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         WILLR.
@@ -835,6 +1430,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def ultosc(
         self,
         time_period1: int = 7,
@@ -850,6 +1446,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def trange(self, array: bool = False) -> Union[float, np.ndarray]:
         """
         TRANGE.
@@ -859,6 +1456,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def boll(
         self,
         n: int,
@@ -879,6 +1477,7 @@ class ArrayManager(object):
 
         return up, down
 
+    @cache_indicator
     def keltner(
         self,
         n: int,
@@ -899,6 +1498,7 @@ class ArrayManager(object):
 
         return up, down
 
+    @cache_indicator
     def donchian(
         self, n: int, array: bool = False
     ) -> Union[
@@ -915,6 +1515,7 @@ class ArrayManager(object):
             return up, down
         return up[-1], down[-1]
 
+    @cache_indicator
     def aroon(
         self,
         n: int,
@@ -932,6 +1533,7 @@ class ArrayManager(object):
             return aroon_up, aroon_down
         return aroon_up[-1], aroon_down[-1]
 
+    @cache_indicator
     def aroonosc(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Aroon Oscillator.
@@ -942,6 +1544,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def minus_dm(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         MINUS_DM.
@@ -952,6 +1555,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def plus_dm(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         PLUS_DM.
@@ -962,6 +1566,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def mfi(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Money Flow Index.
@@ -971,6 +1576,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def ad(self, array: bool = False) -> Union[float, np.ndarray]:
         """
         AD.
@@ -980,6 +1586,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def adosc(
         self,
         fast_period: int,
@@ -994,6 +1601,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def bop(self, array: bool = False) -> Union[float, np.ndarray]:
         """
         BOP.
@@ -1004,6 +1612,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def stoch(
         self,
         fastk_period: int,
@@ -1034,6 +1643,274 @@ class ArrayManager(object):
         return k[-1], d[-1]
 
 
+class PanelArrayManager(object):
+    """
+    For:
+    1. time series container of bar data of multiple symbols
+    2. calculating technical indicator value of all symbols at once
+    3. calculating cross-sectional rank and z-score
+
+    Data is stored as panel of symbols x time, indicator functions return
+    value of each symbol, or panel of values if array is True.
+    """
+
+    def __init__(self, vt_symbols: List[str], size: int = 100) -> None:
+        """Constructor"""
+        self.vt_symbols: List[str] = list(vt_symbols)
+        self.indexes: Dict[str, int] = {s: i for i, s in enumerate(self.vt_symbols)}
+
+        self.count: int = 0
+        self.size: int = size
+        self.inited: bool = False
+
+        # Double size buffer same as ArrayManager, with symbols as 2nd axis
+        self.buffer: np.ndarray = np.zeros((7, len(self.vt_symbols), size * 2))
+        self.end: int = size
+
+    def update_bars(self, bars: Dict[str, BarData]) -> None:
+        """
+        Update bars of the same time into panel. For symbol without bar,
+        prices are filled by previous close price and volume/turnover by 0.
+        """
+        self.count += 1
+        if not self.inited and self.count >= self.size:
+            self.inited = True
+
+        if self.end == self.buffer.shape[2]:
+            self.buffer[:, :, :self.size - 1] = self.buffer[:, :, self.end - self.size + 1:]
+            self.end = self.size - 1
+
+        column: np.ndarray = self.buffer[:, :, self.end]
+        previous: np.ndarray = self.buffer[:, :, self.end - 1]
+
+        column[:4] = previous[3]
+        column[4:6] = 0
+        column[6] = previous[6]
+
+        for vt_symbol, bar in bars.items():
+            index: Optional[int] = self.indexes.get(vt_symbol, None)
+            if index is None:
+                continue
+
+            column[:, index] = (
+                bar.open_price,
+                bar.high_price,
+                bar.low_price,
+                bar.close_price,
+                bar.volume,
+                bar.turnover,
+                bar.open_interest
+            )
+
+        self.end += 1
+
+    def get_panel(self, row: int) -> np.ndarray:
+        """"""
+        return self.buffer[row, :, self.end - self.size:self.end]
+
+    @property
+    def open(self) -> np.ndarray:
+        """
+        Get open price panel.
+        """
+        return self.get_panel(0)
+
+    @property
+    def high(self) -> np.ndarray:
+        """
+        Get high price panel.
+        """
+        return self.get_panel(1)
+
+    @property
+    def low(self) -> np.ndarray:
+        """
+        Get low price panel.
+        """
+        return self.get_panel(2)
+
+    @property
+    def close(self) -> np.ndarray:
+        """
+        Get close price panel.
+        """
+        return self.get_panel(3)
+
+    @property
+    def volume(self) -> np.ndarray:
+        """
+        Get trading volume panel.
+        """
+        return self.get_panel(4)
+
+    @property
+    def turnover(self) -> np.ndarray:
+        """
+        Get trading turnover panel.
+        """
+        return self.get_panel(5)
+
+    @property
+    def open_interest(self) -> np.ndarray:
+        """
+        Get open interest panel.
+        """
+        return self.get_panel(6)
+
+    def sma(self, n: int, array: bool = False) -> np.ndarray:
+        """
+        Simple moving average.
+        """
+        if not array:
+            return self.close[:, -n:].mean(axis=1)
+        return _rolling_mean(self.close, n)
+
+    def ema(self, n: int, array: bool = False) -> np.ndarray:
+        """
+        Exponential moving average.
+        """
+        result: np.ndarray = _recursive_average(self.close, n, 2 / (n + 1))
+        if array:
+            return result
+        return result[:, -1]
+
+    def std(self, n: int, nbdev: int = 1, array: bool = False) -> np.ndarray:
+        """
+        Standard deviation.
+        """
+        if not array:
+            return self.close[:, -n:].std(axis=1) * nbdev
+
+        mean: np.ndarray = _rolling_mean(self.close, n)
+        square_mean: np.ndarray = _rolling_mean(self.close ** 2, n)
+        return np.sqrt(np.maximum(square_mean - mean ** 2, 0)) * nbdev
+
+    def roc(self, n: int, array: bool = False) -> np.ndarray:
+        """
+        ROC.
+        """
+        close: np.ndarray = self.close
+        if not array:
+            return (close[:, -1] / close[:, -n - 1] - 1) * 100
+
+        result: np.ndarray = np.full(close.shape, np.nan)
+        result[:, n:] = (close[:, n:] / close[:, :-n] - 1) * 100
+        return result
+
+    def atr(self, n: int, array: bool = False) -> np.ndarray:
+        """
+        Average True Range (ATR).
+        """
+        high: np.ndarray = self.high[:, 1:]
+        low: np.ndarray = self.low[:, 1:]
+        last_close: np.ndarray = self.close[:, :-1]
+
+        true_range: np.ndarray = np.full(self.close.shape, np.nan)
+        true_range[:, 1:] = np.maximum(
+            high - low,
+            np.maximum(np.abs(high - last_close), np.abs(low - last_close))
+        )
+
+        result: np.ndarray = _recursive_average(true_range, n, 1 / n)
+        if array:
+            return result
+        return result[:, -1]
+
+    def rsi(self, n: int, array: bool = False) -> np.ndarray:
+        """
+        Relative Strenght Index (RSI).
+        """
+        change: np.ndarray = np.full(self.close.shape, np.nan)
+        change[:, 1:] = np.diff(self.close, axis=1)
+
+        gain: np.ndarray = _recursive_average(np.maximum(change, 0), n, 1 / n)
+        loss: np.ndarray = _recursive_average(np.maximum(-change, 0), n, 1 / n)
+
+        total: np.ndarray = gain + loss
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result: np.ndarray = np.where(total > 0, 100 * gain / total, 0)
+        result[np.isnan(gain)] = np.nan
+
+        if array:
+            return result
+        return result[:, -1]
+
+    def donchian(self, n: int, array: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Donchian Channel.
+        """
+        if not array:
+            return self.high[:, -n:].max(axis=1), self.low[:, -n:].min(axis=1)
+
+        up: np.ndarray = np.full(self.close.shape, np.nan)
+        down: np.ndarray = np.full(self.close.shape, np.nan)
+
+        up[:, n - 1:] = sliding_window_view(self.high, n, axis=1).max(axis=2)
+        down[:, n - 1:] = sliding_window_view(self.low, n, axis=1).min(axis=2)
+        return up, down
+
+    @staticmethod
+    def rank(values: np.ndarray) -> np.ndarray:
+        """
+        Cross-sectional rank of values of symbols, scaled to [0, 1].
+        Values can be panel, which is ranked at each time. NaN is not ranked.
+        """
+        valid: np.ndarray = ~np.isnan(values)
+
+        # NaN is sorted to the end, so valid values are ranked from 0
+        ranks: np.ndarray = np.argsort(np.argsort(values, axis=0), axis=0).astype(float)
+        counts: np.ndarray = valid.sum(axis=0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result: np.ndarray = ranks / np.maximum(counts - 1, 1)
+
+        result[~valid] = np.nan
+        return result
+
+    @staticmethod
+    def zscore(values: np.ndarray) -> np.ndarray:
+        """
+        Cross-sectional z-score of values of symbols.
+        Values can be panel, which is scored at each time. NaN is ignored.
+        """
+        mean: np.ndarray = np.nanmean(values, axis=0)
+        std: np.ndarray = np.nanstd(values, axis=0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(std > 0, (values - mean) / std, 0)
+
+
+def _rolling_mean(values: np.ndarray, n: int) -> np.ndarray:
+    """
+    Rolling mean of n columns, the first n - 1 columns are NaN.
+    """
+    result: np.ndarray = np.full(values.shape, np.nan)
+    result[:, n - 1:] = sliding_window_view(values, n, axis=1).mean(axis=2)
+    return result
+
+
+def _recursive_average(values: np.ndarray, n: int, alpha: float) -> np.ndarray:
+    """
+    Exponential average along time seeded by simple average of the first
+    n values which are not NaN, calculated for all symbols at once.
+    """
+    result: np.ndarray = np.full(values.shape, np.nan)
+
+    # Columns with NaN at the start are skipped (e.g. first diff)
+    start: int = int(np.argmax(~np.isnan(values[0]))) if len(values) else 0
+    if values.shape[1] < start + n:
+        return result
+
+    average: np.ndarray = values[:, start:start + n].mean(axis=1)
+    result[:, start + n - 1] = average
+
+    for i in range(start + n, values.shape[1]):
+        average = average + alpha * (values[:, i] - average)
+        result[:, i] = average
+
+    return result
+
+
 def virtual(func: Callable) -> Callable:
     """
     mark a function as "virtual", which means that this function can be override.